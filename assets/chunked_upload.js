@@ -0,0 +1,70 @@
+// Chunked upload for the "Upload File" control (#file-upload).
+// The file is POSTed to /upload/* in CHUNK_SIZE slices and parsed on the server from
+// disk, so it never becomes one base64 string in the browser or in a Dash callback.
+// Without this script dcc.Upload's own (base64) path still works.
+(function () {
+    var CHUNK_SIZE = 4 * 1024 * 1024;
+    var UPLOAD_ID = 'file-upload';
+
+    function showStatus(text) {
+        window.dash_clientside.set_props('timestamp-display', {children: text});
+    }
+
+    function post(url, body) {
+        return fetch(url, {method: 'POST', body: body}).then(function (response) {
+            return response.json().then(function (result) {
+                if (!response.ok) {
+                    throw new Error(result.error || response.statusText);
+                }
+                return result;
+            });
+        });
+    }
+
+    function upload(file) {
+        var name = encodeURIComponent(file.name);
+        return post('/upload/start').then(function (started) {
+            var id = started.upload_id;
+            var sendFrom = function (offset) {
+                if (offset >= file.size) {
+                    showStatus('Converting ' + file.name + '...');
+                    return post('/upload/finish?upload_id=' + id + '&filename=' + name);
+                }
+                showStatus('Uploading ' + file.name + ': ' + Math.floor(100 * offset / file.size) + '%');
+                return post('/upload/chunk?upload_id=' + id + '&offset=' + offset, file.slice(offset, offset + CHUNK_SIZE))
+                    .then(function (result) { return sendFrom(result.received); });
+            };
+            return sendFrom(0);
+        }).then(function (result) {
+            // load_data_from_source picks the converted dataset up from here
+            window.dash_clientside.set_props('upload-done', {data: result});
+        }).catch(function (err) {
+            showStatus('Error loading file: ' + err.message);
+        });
+    }
+
+    function intercept(event, files) {
+        if (!window.dash_clientside || !window.dash_clientside.set_props || !files || !files.length) {
+            return;
+        }
+        // Keep dcc.Upload from reading the file itself
+        event.stopPropagation();
+        event.preventDefault();
+        if (event.target.value !== undefined) {
+            event.target.value = '';
+        }
+        upload(files[0]);
+    }
+
+    // Capture phase on the document runs before React's handlers on the app root
+    document.addEventListener('change', function (event) {
+        if (event.target.type === 'file' && event.target.closest('#' + UPLOAD_ID)) {
+            intercept(event, event.target.files);
+        }
+    }, true);
+    document.addEventListener('drop', function (event) {
+        if (event.target.closest && event.target.closest('#' + UPLOAD_ID)) {
+            intercept(event, event.dataTransfer && event.dataTransfer.files);
+        }
+    }, true);
+})();
@@ -1,14 +1,17 @@
 
 # Third-party imports
 
-from dash import dcc, html
+from dash import dcc, html, dash_table
+import dash_bootstrap_components as dbc
 
+from services.drill_service import TABLE_COLUMNS
 
-def page1_layout(tickets_chart, assignee_chart):
+
+def page1_layout(tickets_chart, assignee_chart, assignee_pages=1):
     return html.Div([
         html.Div([
             html.Div([
-                html.H3("Tickets Opened per Day by Priority"),
+                html.H3("Tickets Opened by Priority"),
             ], style={'textAlign': 'center'}),
 
             html.Div([
@@ -24,6 +27,24 @@ def page1_layout(tickets_chart, assignee_chart):
 
             html.Div([
                 dcc.Graph(id='assignee-contributor-bar-chart', figure=assignee_chart)
-            ], style={'height': '600px', 'overflowY': 'scroll'})
-        ], style={'width': '50%', 'display': 'inline-block'})
+            ], style={'height': '600px', 'overflowY': 'scroll'}),
+
+            # Pages of people, highest assignee + contributor count first
+            dbc.Pagination(id='assignee-contributor-page', max_value=assignee_pages, active_page=1,
+                           fully_expanded=False, previous_next=True, size='sm')
+        ], style={'width': '50%', 'display': 'inline-block'}),
+
+        # Drill-through: the issues behind the last clicked bar, paged, sorted and filtered on the server
+        html.Div([
+            html.H3("Issues", id='drill-through-title'),
+            dcc.Store(id='drill-through-store'),
+            dash_table.DataTable(
+                id='drill-through-table',
+                columns=[{'name': col, 'id': col} for col in TABLE_COLUMNS],
+                page_action='custom', page_current=0, page_size=25,
+                sort_action='custom', sort_mode='multi', sort_by=[],
+                filter_action='custom', filter_query='',
+                style_cell={'textAlign': 'left'}
+            )
+        ], style={'margin-top': '20px'})
     ])
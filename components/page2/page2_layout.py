@@ -0,0 +1,20 @@
+
+# Third-party imports
+
+from dash import dcc, html
+
+from plots.page2.time_in_status import GROUP_BY
+
+
+def page2_layout(assignee_tickets_chart, time_in_status_chart):
+    return html.Div([
+        dcc.Graph(figure=assignee_tickets_chart),
+
+        html.Div([
+            html.H3("Time in Status"),
+            dcc.RadioItems(id='time-in-status-by', options=GROUP_BY, value='Status', inline=True,
+                           inputStyle={'margin-left': '10px', 'margin-right': '4px'}),
+        ], style={'textAlign': 'center'}),
+
+        dcc.Graph(id='time-in-status-chart', figure=time_in_status_chart)
+    ])
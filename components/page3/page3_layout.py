@@ -0,0 +1,14 @@
+
+# Third-party imports
+
+from dash import dcc, html
+
+
+def page3_layout(cumulative_flow_chart):
+    return html.Div([
+        html.Div([
+            html.H3("Cumulative Flow"),
+        ], style={'textAlign': 'center'}),
+
+        dcc.Graph(id='cumulative-flow-chart', figure=cumulative_flow_chart)
+    ])
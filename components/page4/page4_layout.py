@@ -0,0 +1,20 @@
+
+# Third-party imports
+
+from dash import dcc, html
+import dash_bootstrap_components as dbc
+
+
+def page4_layout(people, gantt_chart):
+    return html.Div([
+        html.Div([
+            html.H3("Gantt by Person"),
+        ], style={'textAlign': 'center'}),
+
+        dbc.Row([
+            dbc.Col(dcc.Dropdown(id='gantt-person', options=people, placeholder="Everyone"), width=6),
+            dbc.Col(dcc.DatePickerRange(id='gantt-dates', clearable=True), width=6),
+        ], className="my-2"),
+
+        dcc.Graph(id='gantt-chart', figure=gantt_chart)
+    ])
@@ -3,6 +3,8 @@
 from dash import dcc, html
 import dash_bootstrap_components as dbc
 
+from projects import JIRA_SOURCES
+
 # Top bar with file upload and JIRA fetch
 topbar = html.Div(
     [
@@ -12,12 +14,10 @@ topbar = html.Div(
                 dbc.Col(
                     dcc.Dropdown(
                         id="jira-server-url",
-                        options=[
-                            {'label': 'https://unisysbes.atlassian.net', 'value': 'https://unisysbes.atlassian.net'},
-                            {'label': 'Server 2', 'value': 'https://unisysbes.atlassian.net'},
-                            {'label': 'Server 3', 'value': 'https://unisysbes.atlassian.net'}
-                        ],
-                        placeholder="Select JIRA Server",
+                        # Several sources are fetched concurrently and merged (see jira_service.pull_sources)
+                        options=[{'label': label, 'value': label} for label in JIRA_SOURCES],
+                        multi=True,
+                        placeholder="Select JIRA Projects",
                         style={'width': '100%'}
                     ),
                     width=3,
@@ -39,6 +39,20 @@ topbar = html.Div(
             ],
             className="my-2",
         ),
+        # Background fetch progress, polled while a fetch job is running
+        dbc.Row(
+            [
+                dbc.Col(dbc.Progress(id="fetch-progress", value=0, striped=True, animated=True), width=6),
+                dbc.Col(html.Div(id="fetch-progress-text"), width=4),
+                dbc.Col(dbc.Button("Cancel", id="fetch-cancel-btn", color="danger", size="sm", disabled=True), width=2),
+            ],
+            id="fetch-progress-row",
+            style={'display': 'none'},
+        ),
+        dcc.Interval(id="fetch-progress-interval", interval=1000, disabled=True),
+        dcc.Store(id="fetch-job-id"),
+        dcc.Store(id="fetch-job-done"),
+        dcc.Store(id="upload-done"),  # Set by assets/chunked_upload.js once a chunked upload is converted
     ],
     style={"margin-right": "20%", "padding": "20px", "border-bottom": "1px solid #ccc"}
 )
\ No newline at end of file
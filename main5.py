@@ -1,7 +1,7 @@
 # Python standard library imports
-import io
-import base64
+import os
 import json
+import time
 from datetime import datetime
 
 # Third-party imports
@@ -10,27 +10,293 @@ import dash
 from dash import dcc, html, Input, Output, State, MATCH, ALL
 import plotly.express as px
 import dash_bootstrap_components as dbc
+from flask import request, jsonify
+from dotenv import load_dotenv
+
+# Jira credentials and settings (JIRA_FETCH_WORKERS...) from `.env`, before anything reads them
+load_dotenv()
 
 # Local imports
-from services.jira_service import get_from_jira
-from services.config_service import load_filter_config
+from services.jira_service import pull_sources
+from services.job_service import submit_job, get_job
+from services.config_service import load_filter_config, filter_config_version
+from services.cache_service import load_tables, dataset_meta, current_name, content_hash
+from services.memo_service import memoized
+from services.registry_service import register_dataset, get_dataset, get_derived, get_filtered, filter_state_hash, dataset_source
+from services.codec_service import encode_frames, decode_frames
+from services.changelog_service import events_for
+from services.upload_service import start_upload, append_chunk, finish_upload, save_base64, ingest_file, UploadError
+from services.person_service import PersonIndex
+from services.facet_service import FilterEngine, PERSON_FILTER
+from services.flow_service import CumulativeFlow, flow_deltas, load_flow
+from services.interval_service import IntervalIndex
+from services.status_time_service import StatusTimes
+from services.drill_service import selection_mask, table_page
 from components.topbar import topbar
 from components.sidebar import create_filter_section, sidebar
 from components.content import content
 from components.page1.page1_layout import page1_layout
+from components.page2.page2_layout import page2_layout
+from components.page3.page3_layout import page3_layout
+from components.page4.page4_layout import page4_layout
 
-from plots.page1.assignee_contributor import create_assignee_contributor_chart
+from plots.page1.assignee_contributor import create_assignee_contributor_chart, ranked_people, page_count
 from plots.page1.tickets_opened import create_tickets_opened_chart
+from plots.page2.time_in_status import create_time_in_status_chart
+from plots.page3.cumulative_flow import create_cumulative_flow_chart
+from plots.page4.gantt import create_gantt_chart
+
+def filter_columns():
+    return [filter_item['column'] for filter_item in load_filter_config()['filters']]
+
+def take_rows(df, events, mask):
+    """The issues under `mask` and their events."""
+    df = df[mask]
+    return df, events_for(df, events)
+
+def filter_frames(df, events, filter_values, engine=None):
+    """
+    Apply the sidebar selections (in filter config order) to an (issues, events) pair.
+
+    `engine` is a FilterEngine over `df`, built here if not given.
+    """
+    engine = engine or FilterEngine(df, events, filter_columns())
+    mask, _ = engine.evaluate(filter_values)
+    return take_rows(df, events, mask)
+
+# 'registry': stores hold a dataset id, frames stay in this process (services.registry_service).
+# 'payload': stores carry the frames themselves (services.codec_service), for multi-process deployments.
+DATASET_STORE = os.getenv('DATASET_STORE', 'registry')
+# Closed sidebar filters with more values than this keep their labels until opened
+RELABEL_MAX_VALUES = 200
+# Open status stays (time in status, Gantt bars) run up to when their index was built;
+# indexes and figures are rebuilt once per window of this many seconds
+OPEN_STAY_WINDOW = int(os.getenv('OPEN_STAY_WINDOW', 3600))
+
+def stay_window():
+    """Current OPEN_STAY_WINDOW bucket, part of the keys of everything that counts open stays up to now."""
+    return int(time.time() // OPEN_STAY_WINDOW)
+
+def dataset_engine(dataset_id):
+    """The registry's FilterEngine (and PersonIndex) for a dataset and the current filter config."""
+    columns = filter_columns()
+
+    def build(df, events):
+        index = get_derived(dataset_id, 'person-index', PersonIndex) if PERSON_FILTER in columns else None
+        return FilterEngine(df, events, columns, index)
+    return get_derived(dataset_id, 'filter-engine:' + '|'.join(columns), build)
+
+def raw_store(df, events, source):
+    """raw-data-store contents for an (issues, events) pair."""
+    if DATASET_STORE == 'payload':
+        return {'payload': encode_frames({'issues': df, 'events': events})}
+    dataset_id = register_dataset(df, events, source)
+    # Build the filter engine now rather than on the first filter click
+    dataset_engine(dataset_id)
+    return {'dataset': dataset_id}
+
+def raw_frames(raw_data):
+    """(issues, events) of raw-data-store, or None if the dataset is gone."""
+    if 'payload' in raw_data:
+        frames = decode_frames(raw_data['payload'])
+        return frames['issues'], frames['events']
+    return get_dataset(raw_data['dataset'])
+
+def filter_engine(raw_data, df=None, events=None):
+    """FilterEngine of the raw data: the registry's cached one, or built from the frames."""
+    if 'dataset' in raw_data:
+        engine = dataset_engine(raw_data['dataset'])
+        if engine is not None:
+            return engine
+    if df is None:
+        df, events = raw_frames(raw_data)
+    return FilterEngine(df, events, filter_columns())
+
+def registry_filter(dataset_id):
+    """filter_frames for a registered dataset, using its cached filter engine."""
+    def apply(df, events, filter_values):
+        return filter_frames(df, events, filter_values, dataset_engine(dataset_id))
+    return apply
+
+def facet_key(raw_data, filter_values):
+    """Memo key of the facet counts: dataset id, filter columns and filter state; None for payload data."""
+    if 'dataset' not in raw_data:
+        return None
+    return f"{raw_data['dataset']}:{'|'.join(filter_columns())}:{filter_state_hash(filter_values)}"
+
+def facet_counts(raw_data, filter_values):
+    """Issues per filter value under the other filters' selections (see FilterEngine.evaluate), memoized."""
+    return memoized('facet-counts', facet_key(raw_data, filter_values),
+                    lambda: filter_engine(raw_data).evaluate(filter_values)[1])
+
+def filtered_store(raw_data, filter_values):
+    """
+    (filtered-data-store contents, facet counts) for the sidebar selections.
+
+    The store holds the filtered pair itself, or what is needed to find (or rebuild) it.
+    """
+    if 'payload' in raw_data:
+        df, events = raw_frames(raw_data)
+        mask, counts = filter_engine(raw_data, df, events).evaluate(filter_values)
+        df, events = take_rows(df, events, mask)
+        return {'payload': encode_frames({'issues': df, 'events': events})}, counts
+
+    dataset_id = raw_data['dataset']
+    engine = dataset_engine(dataset_id)
+    if engine is None:
+        return None, None
+    mask, counts = engine.evaluate(filter_values)
+    # One pass gives both; the mask fills the registry if this selection is not cached yet,
+    # the counts are kept for update_filter_options
+    get_filtered(dataset_id, filter_values, lambda df, events, _: take_rows(df, events, mask))
+    memoized('facet-counts', facet_key(raw_data, filter_values), lambda: counts)
+    return {'dataset': dataset_id, 'filters': filter_state_hash(filter_values), 'values': filter_values}, counts
+
+def filtered_frames(filtered_data):
+    if 'payload' in filtered_data:
+        return raw_frames(filtered_data)
+    return get_filtered(filtered_data['dataset'], filtered_data['values'], registry_filter(filtered_data['dataset']))
+
+def filtered_key(filtered_data, df, events):
+    """Memo key of the filtered data: dataset id + filter state hash, or a content hash of the payload frames."""
+    if 'dataset' in filtered_data:
+        return f"{filtered_data['dataset']}:{filtered_data['filters']}"
+    return content_hash(df)[:16] + content_hash(events)[:16]
+
+def cumulative_flow(filtered_data, df, events, key):
+    """
+    CumulativeFlow of the filtered data.
+
+    Without filters, a registered dataset uses the daily table kept up to date
+    by each sync (services.flow_service); otherwise it is computed from the frames.
+    """
+    if 'dataset' in filtered_data and not any(filtered_data['values']):
+        source = dataset_source(filtered_data['dataset'])
+
+        def build(df, events):
+            deltas = load_flow(source[0], source[1]) if source else None
+            return CumulativeFlow(flow_deltas(df, events) if deltas is None else deltas)
+        return get_derived(filtered_data['dataset'], 'cumulative-flow', build)
+    return memoized('cumulative-flow', key, lambda: CumulativeFlow(flow_deltas(df, events)))
+
+def gantt_index(filtered_data, df, events, window):
+    """
+    (IntervalIndex, the issues it was built from, row mask of the sidebar selections or None).
+
+    A registered dataset keeps one index per `stay_window()` (next to its PersonIndex)
+    and applies the selections as a row mask; payload data is indexed per filtered pair.
+    """
+    if 'dataset' in filtered_data:
+        dataset_id = filtered_data['dataset']
+
+        def build(issues, events):
+            return IntervalIndex(issues, events, person_index=get_derived(dataset_id, 'person-index', PersonIndex))
+        index = get_derived(dataset_id, f'interval-index:{window}', build)
+        engine = dataset_engine(dataset_id)
+        dataset = get_dataset(dataset_id)
+        if index is not None and engine is not None and dataset is not None:
+            return index, dataset[0], engine.evaluate(filtered_data['values'])[0]
+    return IntervalIndex(df, events), df, None
+
+def status_times(filtered_data, df, events, key, window):
+    """
+    (StatusTimes, the issues it was built from, row mask of the sidebar selections or None).
+
+    A registered dataset builds its stays once per `stay_window()` and applies the
+    selections as a row mask, so regrouping or refiltering only reruns `percentiles`;
+    payload data is memoized per filtered pair and window.
+    """
+    if 'dataset' in filtered_data:
+        dataset_id = filtered_data['dataset']
+        times = get_derived(dataset_id, f'status-times:{window}', StatusTimes)
+        engine = dataset_engine(dataset_id)
+        dataset = get_dataset(dataset_id)
+        if times is not None and engine is not None and dataset is not None:
+            return times, dataset[0], engine.evaluate(filtered_data['values'])[0]
+    return memoized('status-times', f'{key}:{window}', lambda: StatusTimes(df, events)), df, None
+
+def date_range(start_date, end_date):
+    """(start, end) Timestamps of a DatePickerRange; the end day is included."""
+    start = pd.Timestamp(start_date) if start_date else None
+    end = pd.Timestamp(end_date) + pd.Timedelta(days=1) if end_date else None
+    return start, end
+
+def drill_selection(click_data, figure):
+    """The drill-through selection (see drill_service.selection_mask) of a click on a page-1 chart, or None."""
+    point = click_data['points'][0]
+    meta = figure['layout'].get('meta') or {}
+    name = figure['data'][point['curveNumber']].get('name')
+    if meta.get('chart') == 'tickets-opened':
+        return {'chart': 'tickets-opened', 'date': str(point['y']), 'period': meta['period'], 'priority': name}
+    if meta.get('chart') == 'assignee-contributor':
+        person = point['y']
+        others = person not in meta['people']
+        return {'chart': 'assignee-contributor', 'count': name, 'label': person,
+                'people': meta['people'] if others else [person], 'exclude': others}
+    return None
+
+def selection_title(selection):
+    if selection['chart'] == 'tickets-opened':
+        period = pd.Period(selection['date'], selection['period'])
+        return f"{selection['priority']} issues opened {period.start_time:%Y-%m-%d} to {period.end_time:%Y-%m-%d}"
+    return f"{selection['label']}: {selection['count']}"
+
+def zoomed_range(relayout_data, axis):
+    """
+    (start, end) Timestamps of a date `axis` zoomed in a graph's relayoutData,
+    None if it was reset to the full range, or PreventUpdate if the axis was not touched.
+    """
+    relayout_data = relayout_data or {}
+    if relayout_data.get(f'{axis}.autorange'):
+        return None
+    bounds = relayout_data.get(f'{axis}.range') or [relayout_data.get(f'{axis}.range[0]'), relayout_data.get(f'{axis}.range[1]')]
+    if None in bounds:
+        raise dash.exceptions.PreventUpdate
+    return pd.Timestamp(bounds[0]), pd.Timestamp(bounds[1])
+
+def option_label(value, counts):
+    return f"{value} ({counts[value]})" if counts and value in counts else str(value)
+
+# Parse and validate the filter config up front: a bad entry stops the app here, not inside a callback
+load_filter_config()
 
 # Initialize the Dash app with external stylesheets
-app = dash.Dash(__name__, external_stylesheets=[dbc.themes.BOOTSTRAP])
+# Page components (e.g. the charts) only exist once their page is rendered
+app = dash.Dash(__name__, external_stylesheets=[dbc.themes.BOOTSTRAP], suppress_callback_exceptions=True)
+
+# Chunked upload endpoints (assets/chunked_upload.js): the file is streamed to a temp file
+# and converted once per content, instead of travelling as one base64 string through a callback
+@app.server.route('/upload/start', methods=['POST'])
+def upload_start():
+    return jsonify({'upload_id': start_upload()})
+
+@app.server.route('/upload/chunk', methods=['POST'])
+def upload_chunk():
+    try:
+        received = append_chunk(request.args.get('upload_id'), int(request.args.get('offset', 0)), request.stream)
+    except (UploadError, ValueError) as e:
+        return jsonify({'error': str(e)}), 400
+    return jsonify({'received': received})
+
+@app.server.route('/upload/finish', methods=['POST'])
+def upload_finish():
+    filename = request.args.get('filename', '')
+    try:
+        name, df, _, cached = finish_upload(request.args.get('upload_id'), filename)
+    except UploadError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': f"Error loading file: {str(e)}"}), 500
+    return jsonify({'dataset': name, 'filename': filename, 'rows': len(df), 'cached': cached})
 
 # Layout for the entire app
 app.layout = html.Div(
     [
         dcc.Store(id='stored-filters'),  # Store to retain filter states
-        dcc.Store(id='raw-data-store'),  # Store for raw data
-        dcc.Store(id='filtered-data-store'),  # Store for filtered data
+        dcc.Store(id='raw-data-store'),  # Raw data: dataset id, or the encoded frames (see DATASET_STORE)
+        dcc.Store(id='filtered-data-store'),  # Filtered data: dataset id + filter state, or the encoded frames
+        dcc.Store(id='filter-config-version', data=filter_config_version()),  # Changes when the filter config is edited
+        dcc.Interval(id='config-poll-interval', interval=5000),  # Checks the filter config file's mtime
         dcc.Location(id="url"),  # URL bar to handle page navigation
         topbar,
         dbc.Button("Toggle Sidebar", id="btn_sidebar", n_clicks=0, style=dict(display='none')),  # Hidden
@@ -38,76 +304,177 @@ app.layout = html.Div(
         dbc.Row([
             dbc.Col(dbc.Button("Page 1", href="/page-1", color="primary"), width=2),
             dbc.Col(dbc.Button("Page 2", href="/page-2", color="secondary"), width=2),
+            dbc.Col(dbc.Button("Cumulative Flow", href="/page-3", color="secondary"), width=2),
+            dbc.Col(dbc.Button("Gantt", href="/page-4", color="secondary"), width=2),
         ]),
         content,
     ]
 )
 
+# Start, poll and cancel the background Jira fetch; the Dash worker never blocks on Jira
+@app.callback(
+    [Output("fetch-job-id", "data"),
+     Output("fetch-progress-interval", "disabled"),
+     Output("fetch-progress-row", "style"),
+     Output("fetch-progress", "value"),
+     Output("fetch-progress", "label"),
+     Output("fetch-progress-text", "children"),
+     Output("fetch-cancel-btn", "disabled"),
+     Output("fetch-job-done", "data")],
+    [Input("fetch-jira-btn", "n_clicks"),
+     Input("fetch-progress-interval", "n_intervals"),
+     Input("fetch-cancel-btn", "n_clicks")],
+    [State("jira-server-url", "value"),
+     State("fetch-job-id", "data")],
+    prevent_initial_call=True
+)
+def manage_fetch_job(fetch_clicks, n_intervals, cancel_clicks, sources, job_id):
+    triggered_input = dash.callback_context.triggered[0]['prop_id'].split('.')[0]
+    shown = {'display': 'flex'}
+
+    if triggered_input == "fetch-jira-btn":
+        if not sources:
+            raise dash.exceptions.PreventUpdate
+        running = get_job(job_id) if job_id else None
+        if running is not None and running.status in ('queued', 'running'):
+            raise dash.exceptions.PreventUpdate
+        # Only issues updated since the last fetch are re-pulled, all selected sources at once
+        job = submit_job(f"Fetch {', '.join(sources)}", pull_sources, sources, incremental=True)
+        return job.id, False, shown, 0, "", "Starting fetch...", False, dash.no_update
+
+    job = get_job(job_id) if job_id else None
+    if job is None:
+        return dash.no_update, True, {'display': 'none'}, 0, "", "", True, dash.no_update
+
+    if triggered_input == "fetch-cancel-btn":
+        job.cancel()
+
+    progress = job.progress()
+    percent = int(100 * progress['done'] / progress['total']) if progress['total'] else 0
+    text = f"Page {progress['done']}/{progress['total'] or '?'}, {progress['rate']:.0f} issues/s"
+    if progress['eta'] is not None:
+        text += f", ~{progress['eta']:.0f}s left"
+    if job.cancel_event.is_set() and job.status in ('queued', 'running'):
+        text = "Cancelling..."
+
+    if job.status in ('queued', 'running'):
+        return dash.no_update, False, shown, percent, f"{percent}%", text, job.cancel_event.is_set(), dash.no_update
+
+    # Finished: stop polling and hand the job over to load_data_from_source
+    if job.status == 'done':
+        text = f"Fetched {progress['items']} issues"
+    elif job.status == 'failed':
+        text = f"Fetch failed: {job.error}"
+    else:
+        text = "Fetch cancelled"
+    return dash.no_update, True, shown, percent, f"{percent}%", text, True, {'job_id': job.id, 'status': job.status}
+
 @app.callback(
     [Output("raw-data-store", "data"),
      Output("timestamp-display", "children"),
      Output("sidebar", "children")],
-    [Input("fetch-jira-btn", "n_clicks"),
-     Input("file-upload", "contents")],
-    [State("jira-server-url", "value"),
-     State("file-upload", "filename")]
+    [Input("fetch-job-done", "data"),
+     Input("upload-done", "data"),
+     Input("file-upload", "contents"),
+     Input("filter-config-version", "data")],
+    [State("file-upload", "filename"),
+     State("raw-data-store", "data")]
 )
-def load_data_from_source(jira_clicks, file_contents, server_url, filename):
+def load_data_from_source(fetch_job_done, upload_done, file_contents, config_version, filename, raw_data):
     ctx = dash.callback_context
 
-    if not ctx.triggered:
-        raise dash.exceptions.PreventUpdate
-
-    # Determine the triggered input
-    triggered_input = ctx.triggered[0]['prop_id'].split('.')[0]
-
     # Initialize the return variables
     df = None
     timestamp_msg = None
+    stored = None
 
-    if triggered_input == "fetch-jira-btn" and server_url:
-        # Fetch from JIRA
-        df = get_from_jira(server_url)  # Assuming this function exists and returns a DataFrame
+    if not ctx.triggered:
+        # Initial page load: start from the last dataset in the local cache, if any
+        tables = load_tables()
+        if tables is None:
+            raise dash.exceptions.PreventUpdate
+        df, events = tables
+        source = current_name()
+        meta = dataset_meta()
+        timestamp_msg = f"Cached data from {datetime.fromtimestamp(meta['saved_at']).strftime('%Y-%m-%d %H:%M:%S')} (v{meta['version']})"
+        triggered_input = None
+    else:
+        # Determine the triggered input
+        triggered_input = ctx.triggered[0]['prop_id'].split('.')[0]
+
+    if triggered_input == "fetch-job-done" and fetch_job_done and fetch_job_done['status'] == 'done':
+        # Pick up the result of the background fetch
+        job = get_job(fetch_job_done['job_id'])
+        if job is None or job.result is None:
+            raise dash.exceptions.PreventUpdate
+        df, events = job.result
+        job.result = None  # The frames now live in the registry; don't keep a second copy around
+        # The source's own dataset, or the merge of several (see pull_sources)
+        source = current_name()
         timestamp_msg = f"Jira data fetched at {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"
 
+    elif triggered_input == "upload-done" and upload_done:
+        # A chunked upload finished; /upload/finish already converted and cached it
+        tables = load_tables(upload_done['dataset'])
+        if tables is None:
+            raise dash.exceptions.PreventUpdate
+        df, events = tables
+        source = upload_done['dataset']
+        timestamp_msg = f"Local file loaded at {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}: {upload_done['filename']}"
+
     elif triggered_input == "file-upload" and file_contents:
-        # Handle file upload
-        content_type, content_string = file_contents.split(',')
-        decoded = base64.b64decode(content_string)
+        # Plain dcc.Upload (the browser script is not loaded): decode to a temp file, then the same conversion
+        path = save_base64(file_contents)
         try:
-            if filename.endswith(".csv"):
-                df = pd.read_csv(io.StringIO(decoded.decode('utf-8')))
-            elif filename.endswith(".xlsx"):
-                df = pd.read_excel(io.BytesIO(decoded))
-            else:
-                return dash.no_update, "Unsupported file type", dash.no_update
+            source, df, events, _ = ingest_file(path, filename)
+        except UploadError as e:
+            return dash.no_update, str(e), dash.no_update
         except Exception as e:
             return dash.no_update, f"Error loading file: {str(e)}", dash.no_update
-
+        finally:
+            path.unlink(missing_ok=True)
         timestamp_msg = f"Local file loaded at {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}: {filename}"
 
+    elif triggered_input == "filter-config-version" and raw_data:
+        # The filter config file changed: rebuild the sidebar for the data already loaded
+        frames = raw_frames(raw_data)
+        if frames is None:
+            raise dash.exceptions.PreventUpdate
+        df, events = frames
+        stored = raw_data
+        timestamp_msg = dash.no_update
+
     if df is None:
         raise dash.exceptions.PreventUpdate
 
-    # Convert dataframe to JSON for storing
-    df['Created Date'] = pd.to_datetime(df['Created Date'])
+    if stored is None:
+        df['Created Date'] = pd.to_datetime(df['Created Date'])
+        raw_data = raw_store(df, events, source)
     filter_config = load_filter_config()
 
     # Generate the sidebar based on the config file and data
+    engine = filter_engine(raw_data, df, events)
     sidebar_layout = [html.H1('Filters')]
     for filter_item in filter_config['filters']:
         col = filter_item['column']
-        if col == 'Person':
-            columns = ['Assignee', *[f'Changed By {x}' for x in range(76)]]
-            values = pd.concat([pd.Series(df[col].dropna().unique()) for col in columns])
-            values = sorted(values.unique())
-        else:
-            values = df[col].dropna().unique()
-        filter_section = create_filter_section(col, values)
+        filter_section = create_filter_section(col, engine.values[col])
         sidebar_layout.append(html.Hr())
         sidebar_layout.append(filter_section)
 
-    return df.to_json(date_format='iso', orient='split'), timestamp_msg, sidebar_layout
+    return dash.no_update if stored else raw_data, timestamp_msg, sidebar_layout
+
+# Notice edits to the filter config so load_data_from_source rebuilds the sidebar
+@app.callback(
+    Output("filter-config-version", "data"),
+    [Input("config-poll-interval", "n_intervals")],
+    [State("filter-config-version", "data")],
+    prevent_initial_call=True
+)
+def watch_filter_config(n_intervals, known_version):
+    version = filter_config_version()
+    if version == known_version:
+        raise dash.exceptions.PreventUpdate
+    return version
 
 # Callback to update the content based on URL and filters
 @app.callback(
@@ -115,51 +482,189 @@ def load_data_from_source(jira_clicks, file_contents, server_url, filename):
     [Input("url", "pathname"),
      Input('filtered-data-store', 'data')]
 )
-def render_page_content(pathname, filtered_data_json):
-    if filtered_data_json is None:
+def render_page_content(pathname, filtered_data):
+    if filtered_data is None:
         raise dash.exceptions.PreventUpdate
-    filtered_df = pd.read_json(filtered_data_json, orient='split')
+    frames = filtered_frames(filtered_data)
+    if frames is None:
+        raise dash.exceptions.PreventUpdate
+    filtered_df, filtered_events = frames
+    # Charts and their aggregates are memoized per dataset and filter state
+    key = filtered_key(filtered_data, filtered_df, filtered_events)
 
     if pathname == "/" or pathname == "/page-1":
 
         # pie_fig = px.pie(filtered_df, names='Priority', title='Priority Distribution')
-        ticket_chart = create_tickets_opened_chart(filtered_df)
-        assignee_chart = create_assignee_contributor_chart(filtered_df)
-        return page1_layout(ticket_chart, assignee_chart)
+        ticket_chart = memoized('tickets-opened-figure', key, lambda: create_tickets_opened_chart(filtered_df, key))
+        assignee_chart = memoized('assignee-contributor-figure', f'{key}:1',
+                                  lambda: create_assignee_contributor_chart(filtered_df, filtered_events, key))
+        assignee_pages = page_count(ranked_people(filtered_df, filtered_events, key))
+        return page1_layout(ticket_chart, assignee_chart, assignee_pages)
         #return html.Div([dcc.Graph(figure=pie_fig)])
     elif pathname == "/page-2":
-        bar_fig = px.bar(filtered_df, x='Assignee', y='JIRA Key', title='Assignee-wise JIRA Tickets', barmode='group')
-        return html.Div([dcc.Graph(figure=bar_fig)])
+        bar_fig = memoized('assignee-tickets-figure', key, lambda: px.bar(filtered_df, x='Assignee', y='JIRA Key', title='Assignee-wise JIRA Tickets', barmode='group'))
+        window = stay_window()
+        times, issues, row_mask = status_times(filtered_data, filtered_df, filtered_events, key, window)
+        status_fig = memoized('time-in-status-figure', f'{key}:{window}:Status',
+                              lambda: create_time_in_status_chart(times, issues, f'{key}:{window}', row_mask=row_mask))
+        return page2_layout(bar_fig, status_fig)
+    elif pathname == "/page-3":
+        flow = cumulative_flow(filtered_data, filtered_df, filtered_events, key)
+        flow_fig = memoized('cumulative-flow-figure', key, lambda: create_cumulative_flow_chart(flow))
+        return page3_layout(flow_fig)
+    elif pathname == "/page-4":
+        window = stay_window()
+        index, issues, row_mask = gantt_index(filtered_data, filtered_df, filtered_events, window)
+        gantt_fig = memoized('gantt-figure', f'{key}:{window}', lambda: create_gantt_chart(index, issues, row_mask=row_mask))
+        return page4_layout(index.person_index.names, gantt_fig)
     else:
         return html.Div([html.H3("404: Page Not Found")])
 
+# Re-bucket the tickets-opened chart for the zoomed date range (day / week / month)
+@app.callback(
+    Output('tickets-opened-priority-chart', 'figure'),
+    [Input('tickets-opened-priority-chart', 'relayoutData')],
+    [State('filtered-data-store', 'data')],
+    prevent_initial_call=True
+)
+def zoom_tickets_opened(relayout_data, filtered_data):
+    date_range = zoomed_range(relayout_data, 'yaxis')
+    if filtered_data is None:
+        raise dash.exceptions.PreventUpdate
+    frames = filtered_frames(filtered_data)
+    if frames is None:
+        raise dash.exceptions.PreventUpdate
+    filtered_df, filtered_events = frames
+    key = filtered_key(filtered_data, filtered_df, filtered_events)
+    if date_range is None:
+        return memoized('tickets-opened-figure', key, lambda: create_tickets_opened_chart(filtered_df, key))
+    return create_tickets_opened_chart(filtered_df, key, date_range)
+
+# Show another page of people on the assignee/contributor chart
+@app.callback(
+    Output('assignee-contributor-bar-chart', 'figure'),
+    [Input('assignee-contributor-page', 'active_page')],
+    [State('filtered-data-store', 'data')],
+    prevent_initial_call=True
+)
+def page_assignee_contributor(page, filtered_data):
+    if filtered_data is None or not page:
+        raise dash.exceptions.PreventUpdate
+    frames = filtered_frames(filtered_data)
+    if frames is None:
+        raise dash.exceptions.PreventUpdate
+    filtered_df, filtered_events = frames
+    key = filtered_key(filtered_data, filtered_df, filtered_events)
+    return memoized('assignee-contributor-figure', f'{key}:{page}',
+                    lambda: create_assignee_contributor_chart(filtered_df, filtered_events, key, page))
+
+# Regroup the time-in-status percentiles (by status, priority or assignee)
+@app.callback(
+    Output('time-in-status-chart', 'figure'),
+    [Input('time-in-status-by', 'value')],
+    [State('filtered-data-store', 'data')],
+    prevent_initial_call=True
+)
+def group_time_in_status(by, filtered_data):
+    if filtered_data is None or not by:
+        raise dash.exceptions.PreventUpdate
+    frames = filtered_frames(filtered_data)
+    if frames is None:
+        raise dash.exceptions.PreventUpdate
+    filtered_df, filtered_events = frames
+    key = filtered_key(filtered_data, filtered_df, filtered_events)
+    window = stay_window()
+    times, issues, row_mask = status_times(filtered_data, filtered_df, filtered_events, key, window)
+    return memoized('time-in-status-figure', f'{key}:{window}:{by}',
+                    lambda: create_time_in_status_chart(times, issues, f'{key}:{window}', by, row_mask))
+
+# Gantt for the selected person and dates: a range query on the interval index
+@app.callback(
+    Output('gantt-chart', 'figure'),
+    [Input('gantt-person', 'value'),
+     Input('gantt-dates', 'start_date'),
+     Input('gantt-dates', 'end_date')],
+    [State('filtered-data-store', 'data')],
+    prevent_initial_call=True
+)
+def query_gantt(person, start_date, end_date, filtered_data):
+    if filtered_data is None:
+        raise dash.exceptions.PreventUpdate
+    frames = filtered_frames(filtered_data)
+    if frames is None:
+        raise dash.exceptions.PreventUpdate
+    filtered_df, filtered_events = frames
+    key = filtered_key(filtered_data, filtered_df, filtered_events)
+    window = stay_window()
+    index, issues, row_mask = gantt_index(filtered_data, filtered_df, filtered_events, window)
+    start, end = date_range(start_date, end_date)
+    return memoized('gantt-figure', f'{key}:{window}:{person}:{start_date}:{end_date}',
+                    lambda: create_gantt_chart(index, issues, person, start, end, row_mask))
+
+# Clicking a bar on page 1 selects the issues behind it for the drill-through table
+@app.callback(
+    [Output('drill-through-store', 'data'),
+     Output('drill-through-table', 'page_current')],
+    [Input('tickets-opened-priority-chart', 'clickData'),
+     Input('assignee-contributor-bar-chart', 'clickData')],
+    [State('tickets-opened-priority-chart', 'figure'),
+     State('assignee-contributor-bar-chart', 'figure')],
+    prevent_initial_call=True
+)
+def select_drill_through(tickets_click, assignee_click, tickets_figure, assignee_figure):
+    triggered_input = dash.callback_context.triggered[0]['prop_id'].split('.')[0]
+    if triggered_input == 'tickets-opened-priority-chart' and tickets_click:
+        selection = drill_selection(tickets_click, tickets_figure)
+    elif triggered_input == 'assignee-contributor-bar-chart' and assignee_click:
+        selection = drill_selection(assignee_click, assignee_figure)
+    else:
+        selection = None
+    if selection is None:
+        raise dash.exceptions.PreventUpdate
+    return selection, 0
+
+# One page of the drill-through table: selected, filtered and sorted server-side
+@app.callback(
+    [Output('drill-through-table', 'data'),
+     Output('drill-through-table', 'page_count'),
+     Output('drill-through-title', 'children')],
+    [Input('drill-through-store', 'data'),
+     Input('drill-through-table', 'page_current'),
+     Input('drill-through-table', 'page_size'),
+     Input('drill-through-table', 'sort_by'),
+     Input('drill-through-table', 'filter_query')],
+    [State('filtered-data-store', 'data')],
+    prevent_initial_call=True
+)
+def page_drill_through(selection, page_current, page_size, sort_by, filter_query, filtered_data):
+    if selection is None or filtered_data is None:
+        raise dash.exceptions.PreventUpdate
+    frames = filtered_frames(filtered_data)
+    if frames is None:
+        raise dash.exceptions.PreventUpdate
+    filtered_df, filtered_events = frames
+    key = filtered_key(filtered_data, filtered_df, filtered_events)
+    # The selection's rows are memoized; paging, sorting and filtering only touch those
+    mask = memoized('drill-through', f'{key}:{json.dumps(selection, sort_keys=True)}',
+                    lambda: selection_mask(filtered_df, filtered_events, selection))
+    records, page_count, n_rows = table_page(filtered_df, mask, page_current or 0, page_size, sort_by, filter_query)
+    return records, page_count, f"{selection_title(selection)} ({n_rows} issues)"
+
 # Callback to apply filters and store filtered data
 @app.callback(
     Output("filtered-data-store", "data"),
     [Input({'type': 'filter-options', 'index': ALL}, 'value')],
     [State('raw-data-store', 'data')]
 )
-def apply_filters(filter_values, raw_data_json):
-    if raw_data_json is None:
+def apply_filters(filter_values, raw_data):
+    if raw_data is None:
         raise dash.exceptions.PreventUpdate
 
-    df = pd.read_json(raw_data_json, orient='split')
-    filter_config = load_filter_config()
-
-    for i, filter_item in enumerate(filter_config['filters']):
-        column = filter_item['column']
-        values = filter_values[i]
-        # Custom filter for "Person"
-        if column == 'Person':
-            columns = ['Assignee', *[f'Changed By {x}' for x in range(76)]]
-            tmp_df = df[df[columns].apply(lambda row: row.isin(values).any(), axis=1)]
-            if len(tmp_df):
-                df = tmp_df
-        else:
-            if values:
-                df = df[df[column].isin(values)]
-
-    return df.to_json(date_format='iso', orient='split')
+    # The facet counts stay on the server (see update_filter_options)
+    filtered_data, _ = filtered_store(raw_data, filter_values)
+    if filtered_data is None:
+        raise dash.exceptions.PreventUpdate
+    return filtered_data
 
 # Toggle Collapse callback (handles expanding/collapsing filter sections)
 @app.callback(
@@ -186,62 +691,89 @@ def toggle_sidebar(n_clicks, style):
         style["display"] = "none"
     return style
 
-# Update filters dynamically (handles search, select all, clear functionality)
+# Relabel filter options (handles search and facet counts). Only `options` is written here:
+# writing `value` would close a callback cycle with apply_filters. The counts are computed
+# (or found memoized) on the server, and only open or short filters are relabelled.
+@app.callback(
+    Output({'type': 'filter-options', 'index': ALL}, 'options'),
+    [Input({'type': 'search', 'index': ALL}, 'value'),
+     Input({'type': 'filter-options', 'index': ALL}, 'value'),
+     Input({'type': 'filter-collapse', 'index': ALL}, 'is_open')],
+    [State('raw-data-store', 'data')]
+)
+def update_filter_options(search_values, filter_values, open_states, raw_data):
+    if raw_data is None:
+        raise dash.exceptions.PreventUpdate
+
+    engine = filter_engine(raw_data)
+    filter_config = load_filter_config()
+    n_filters = len(filter_config['filters'])
+
+    # A search box or a filter being opened rebuilds that filter; new selections
+    # (or the initial call) relabel every filter whose labels can be seen
+    edited = set()
+    selections_changed = not dash.callback_context.triggered
+    for triggered in dash.callback_context.triggered:
+        prop_id, prop = triggered['prop_id'].rsplit('.', 1)
+        if not prop_id.startswith('{'):
+            continue
+        component = json.loads(prop_id)
+        if component['type'] == 'filter-options':
+            selections_changed = True
+        elif component['type'] == 'search' or triggered['value']:  # Searched, or opened
+            edited.add(component['index'])
+
+    counts = None
+    updated_options = [dash.no_update] * n_filters
+    for i, filter_item in enumerate(filter_config['filters']):
+        column = filter_item['column']
+        visible = (open_states[i] if i < len(open_states) else False) or len(engine.values[column]) <= RELABEL_MAX_VALUES
+        if not (column.lower() in edited or (selections_changed and visible)):
+            continue
+        if counts is None:
+            counts = facet_counts(raw_data, filter_values)
+        # Apply search filter (precomputed, case-folded facet dictionary)
+        matches = engine.search(column, search_values[i])
+        updated_options[i] = [{'label': option_label(val, counts[i]), 'value': val} for val in matches]
+
+    return updated_options
+
+# Update filter selections (handles select all and clear functionality)
 @app.callback(
-    [Output({'type': 'filter-options', 'index': ALL}, 'options'),
-     Output({'type': 'filter-options', 'index': ALL}, 'value'),
+    [Output({'type': 'filter-options', 'index': ALL}, 'value'),
      Output({'type': 'select-all-btn', 'index': ALL}, 'n_clicks'),
      Output({'type': 'clear-btn', 'index': ALL}, 'n_clicks')],
-    [Input({'type': 'search', 'index': ALL}, 'value'),
-     Input({'type': 'select-all-btn', 'index': ALL}, 'n_clicks'),
+    [Input({'type': 'select-all-btn', 'index': ALL}, 'n_clicks'),
      Input({'type': 'clear-btn', 'index': ALL}, 'n_clicks')],
-    [State({'type': 'filter-options', 'index': ALL}, 'value'),
-     State('raw-data-store', 'data')]
+    [State({'type': 'search', 'index': ALL}, 'value'),
+     State('raw-data-store', 'data')],
+    prevent_initial_call=True
 )
-def update_filters(search_values, select_all_clicks, clear_clicks, current_values, raw_data_json):
-    if raw_data_json is None:
-        return dash.no_update, dash.no_update, dash.no_update, dash.no_update
+def update_filters(select_all_clicks, clear_clicks, search_values, raw_data):
+    if raw_data is None:
+        raise dash.exceptions.PreventUpdate
 
-    df = pd.read_json(raw_data_json, orient='split')
+    engine = filter_engine(raw_data)
     filter_config = load_filter_config()
+    n_filters = len(filter_config['filters'])
 
-    updated_options = []
-    updated_values = []
-    reset_select_all_clicks = [0] * len(filter_config['filters'])  # Reset select all clicks
-    reset_clear_clicks = [0] * len(filter_config['filters'])  # Reset clear clicks
+    # Untouched values stay no_update so apply_filters does not re-run
+    updated_values = [dash.no_update] * n_filters
+    reset_select_all_clicks = [dash.no_update] * n_filters
+    reset_clear_clicks = [dash.no_update] * n_filters
 
     for i, filter_item in enumerate(filter_config['filters']):
-        column = filter_item['column']
-        if column == 'Person':
-            columns = ['Assignee', *[f'Changed By {x}' for x in range(76)]]
-            unique_values = pd.concat([pd.Series(df[col].dropna().unique()) for col in columns])
-            unique_values_sorted = sorted(unique_values.unique())
-            full_options = [{'label': str(val), 'value': str(val)} for val in unique_values_sorted]
-        else:
-            full_options = [{'label': str(val), 'value': str(val)} for val in sorted(df[column].dropna().unique())]
-
-        # Apply search filter
-        search_value = search_values[i]
-        if search_value:
-            filtered_options = [opt for opt in full_options if search_value.lower() in opt['label'].lower()]
-        else:
-            filtered_options = full_options
-
-        # Handle Select All
-        if select_all_clicks[i] > 0:
-            selected_values = [opt['value'] for opt in filtered_options]
+        # Handle Select All: every value matching the filter's search box
+        if select_all_clicks[i]:
+            updated_values[i] = engine.search(filter_item['column'], search_values[i])
             reset_select_all_clicks[i] = 0  # Reset after selecting all
         # Handle Clear
-        elif clear_clicks[i] > 0:
-            selected_values = []
+        elif clear_clicks[i]:
+            updated_values[i] = []
             reset_clear_clicks[i] = 0  # Reset after clearing
-        else:
-            selected_values = current_values[i]  # Keep current selections
-
-        updated_options.append(filtered_options)
-        updated_values.append(selected_values)
+        # Otherwise keep the current selections (no_update: nothing for apply_filters to redo)
 
-    return updated_options, updated_values, reset_select_all_clicks, reset_clear_clicks
+    return updated_values, reset_select_all_clicks, reset_clear_clicks
 
 
 # Run the app
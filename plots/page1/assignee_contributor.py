@@ -1,7 +1,71 @@
 import pandas as pd
 import plotly.express as px
 
-def create_assignee_contributor_chart(data: pd.DataFrame):
+from services.memo_service import memoized
+from services.drill_service import selection_mask
+
+# People per page of the chart; the rest share one "Others" bar
+PEOPLE_PER_PAGE = 25
+
+def assignee_contributor_counts(data: pd.DataFrame, events: pd.DataFrame) -> pd.DataFrame:
+    """Per person: issues assigned, and issues whose status they changed without being the assignee."""
+    # astype(object): a categorical would also count the people with no issue here
+    assignee_counts = data['Assignee'].astype(object).value_counts().reset_index()
+    assignee_counts.columns = ['Person', 'Assignee Count']
+
+    # One row per (issue, person who changed its status)
+    contributor_df = events[['JIRA Key', 'Changed By']].astype(object).drop_duplicates()
+    contributor_df = contributor_df.rename(columns={'Changed By': 'Contributor'})
+    contributor_df = contributor_df.merge(data[['JIRA Key', 'Assignee']].astype(object), on='JIRA Key', how='left')
+    contributor_df = contributor_df[contributor_df['Contributor'] != contributor_df['Assignee']]
+
+    contributor_counts = contributor_df['Contributor'].value_counts().reset_index()
+    contributor_counts.columns = ['Person', 'Contributor Count']
+
+    # Merge assignee and contributor counts
+    merged_counts = pd.merge(assignee_counts, contributor_counts, how='outer', on='Person').fillna(0)
+    return merged_counts.sort_values(by=['Assignee Count', 'Person'], ascending=True)
+
+def ranked_counts(merged_counts: pd.DataFrame) -> pd.DataFrame:
+    """People by assignee + contributor count, highest first (ties by name)."""
+    total = merged_counts['Assignee Count'] + merged_counts['Contributor Count']
+    order = pd.DataFrame({'Total': -total, 'Person': merged_counts['Person'].astype(str)}).sort_values(['Total', 'Person']).index
+    return merged_counts.loc[order].reset_index(drop=True)
+
+def page_count(ranked: pd.DataFrame) -> int:
+    return max(1, -(-len(ranked) // PEOPLE_PER_PAGE))
+
+def people_page(ranked: pd.DataFrame, page: int) -> pd.DataFrame:
+    """Page `page` (from 1) of the ranking, plus an "Others" row for everyone else (flagged in `Others`), in plotting order."""
+    start = (page - 1) * PEOPLE_PER_PAGE
+    shown = ranked.iloc[start:start + PEOPLE_PER_PAGE]
+    rest = ranked.drop(index=shown.index)
+    # Horizontal bars are drawn bottom-up: "Others" first, the top-ranked person last (on top)
+    if len(rest):
+        others = pd.DataFrame({'Person': [f'Others ({len(rest)} people)'],
+                               'Assignee Count': [rest['Assignee Count'].sum()],
+                               'Contributor Count': [rest['Contributor Count'].sum()],
+                               'Others': [True]})
+        shown = pd.concat([others, shown.iloc[::-1].assign(Others=False)], ignore_index=True)
+    else:
+        shown = shown.iloc[::-1].assign(Others=False)
+    return shown
+
+def distinct_others(data: pd.DataFrame, events: pd.DataFrame, people) -> dict:
+    """
+    Assignee and Contributor Count of "Others" (everyone but `people`) in distinct
+    issues, as its drill-through lists them: an issue several of them changed counts once.
+    """
+    selection = {'chart': 'assignee-contributor', 'people': list(people), 'exclude': True}
+    return {count: int(selection_mask(data, events, {**selection, 'count': count}).sum())
+            for count in ('Assignee Count', 'Contributor Count')}
+
+def ranked_people(data: pd.DataFrame, events: pd.DataFrame, cache_key=None) -> pd.DataFrame:
+    """Memoized ranking of the (memoized) assignee/contributor counts."""
+    return memoized('assignee-contributor-ranked', cache_key, lambda: ranked_counts(
+        memoized('assignee-contributor', cache_key, lambda: assignee_contributor_counts(data, events))))
+
+def create_assignee_contributor_chart(data: pd.DataFrame, events: pd.DataFrame, cache_key=None, page: int=1):
     # if data is None:
     #     return px.bar(title='No data available. Fetch data to see the graph.')
 
@@ -11,22 +75,15 @@ def create_assignee_contributor_chart(data: pd.DataFrame):
     # TODO error handling
 
     try:
-        # Process data for the chart (same as before)
-        assignee_counts = data['Assignee'].value_counts().reset_index()
-        assignee_counts.columns = ['Person', 'Assignee Count']
-
-        contributor_columns = [f'Changed By {i}' for i in range(76)]
-        contributor_df = pd.melt(data, id_vars=['JIRA Key'], value_vars=contributor_columns, value_name='Contributor')
-        contributor_df = contributor_df.drop_duplicates(subset=['JIRA Key', 'Contributor'])
-        contributor_df = contributor_df.merge(data[['JIRA Key', 'Assignee']], on='JIRA Key', how='left')
-        contributor_df = contributor_df[contributor_df['Contributor'] != contributor_df['Assignee']]
-
-        contributor_counts = contributor_df['Contributor'].value_counts().reset_index()
-        contributor_counts.columns = ['Person', 'Contributor Count']
-
-        # Merge assignee and contributor counts
-        merged_counts = pd.merge(assignee_counts, contributor_counts, how='outer', on='Person').fillna(0)
-        merged_counts = merged_counts.sort_values(by=['Assignee Count', 'Person'], ascending=True)
+        # Process data for the chart, memoized per dataset and filter state (see services.memo_service);
+        # only one page of people (and the "Others" total) goes into the figure
+        merged_counts = people_page(ranked_people(data, events, cache_key), page)
+        others = merged_counts['Others']
+        shown_people = list(merged_counts.loc[~others, 'Person'])
+        if others.any():
+            # Per-person counts overlap; "Others" counts its issues once, like the drill-through table
+            for count, n_issues in distinct_others(data, events, shown_people).items():
+                merged_counts.loc[others, count] = n_issues
 
         # # Filter the data based on selected people
         # if selected_people:
@@ -49,12 +106,12 @@ def create_assignee_contributor_chart(data: pd.DataFrame):
             }
         )
 
-        # Update layout to make the chart height dynamic based on the number of people
-        n_people = len(merged_counts)
-        height = int(max(600, (n_people / 120) * 5000))
-        
+        # At most PEOPLE_PER_PAGE + 1 bars, so a fixed height fits every page
         fig.update_layout(
-            height=height,
+            height=600,
+            yaxis=dict(categoryorder='array', categoryarray=list(merged_counts['Person'])),
+            # People on this page, for the drill-through ("Others" is everyone else)
+            meta={'chart': 'assignee-contributor', 'people': shown_people},
             margin=dict(l=20, r=20, t=50, b=20),
             showlegend=True
         )
@@ -1,7 +1,71 @@
 import pandas as pd
 import plotly.express as px
+import plotly.graph_objects as go
 
-def create_tickets_opened_chart(data: pd.DataFrame):
+from services.memo_service import memoized
+
+PRIORITY_ORDER = ['Highest', 'High', 'Medium', 'Low'][::-1]  # Order of stacking
+PRIORITY_COLORS = {
+    'Highest': '#ff0000',
+    'High': '#ffa500',
+    'Medium': '#ffff00',
+    'Low': '#008000'
+}
+# (name, pandas period, tick format), finest first: the first one giving at most
+# MAX_BARS bars over the visible range is used
+BUCKETS = [
+    ('day', 'D', '%a, %Y-%m-%d'),
+    ('week', 'W', 'Week of %Y-%m-%d'),
+    ('month', 'M', '%b %Y'),
+]
+MAX_BARS = 120
+# Pixels per bar; the chart is at least 600 px tall
+BAR_HEIGHT = 14
+
+def tickets_per_day_counts(data: pd.DataFrame) -> pd.DataFrame:
+    """Tickets opened per (day, priority)."""
+    created = data['Created Date']
+    if not pd.api.types.is_datetime64_any_dtype(created):
+        created = pd.to_datetime(created)
+    tickets_per_day = data.groupby([created.dt.date.rename('Created Date'), 'Priority'], observed=True).size().reset_index(name='Count')
+    tickets_per_day.rename(columns={'Created Date': 'Date'}, inplace=True)
+    tickets_per_day['Date'] = pd.to_datetime(tickets_per_day['Date'])
+    return tickets_per_day
+
+def bucket_counts(tickets_per_day: pd.DataFrame, period: str) -> pd.DataFrame:
+    """Daily counts summed per (bucket start, priority)."""
+    if period == 'D':
+        return tickets_per_day
+    starts = tickets_per_day['Date'].dt.to_period(period).dt.start_time
+    return tickets_per_day.groupby([starts, 'Priority'], observed=True)['Count'].sum().reset_index()
+
+def choose_bucket(start, end):
+    """(name, period, tick format) of the finest bucket showing `start`..`end` in at most MAX_BARS bars."""
+    for bucket in BUCKETS:
+        if pd.Period(end, bucket[1]).ordinal - pd.Period(start, bucket[1]).ordinal < MAX_BARS:
+            return bucket
+    return BUCKETS[-1]
+
+def stacked_webgl_chart(counts: pd.DataFrame) -> go.Figure:
+    """Stacked areas drawn with WebGL, for ranges with more buckets than MAX_BARS."""
+    table = counts.pivot_table(index='Date', columns='Priority', values='Count', aggfunc='sum', fill_value=0, observed=True)
+    priorities = [p for p in PRIORITY_ORDER if p in table.columns] + [p for p in table.columns if p not in PRIORITY_ORDER]
+    stacked = table[priorities].cumsum(axis=1)
+    fig = go.Figure()
+    for i, priority in enumerate(priorities):
+        fig.add_trace(go.Scattergl(
+            x=stacked[priority], y=stacked.index, name=str(priority), mode='lines',
+            fill='tozerox' if i == 0 else 'tonextx',
+            line=dict(color=PRIORITY_COLORS.get(priority), width=1),
+            customdata=table[priority], hovertemplate='%{y}: %{customdata}',
+        ))
+    return fig
+
+def create_tickets_opened_chart(data: pd.DataFrame, cache_key=None, date_range=None):
+    """
+    Tickets opened per day, week or month by priority, whichever keeps the
+    visible range (`date_range`, default all of it) within MAX_BARS bars.
+    """
 
     # if data is None:
     #     return px.bar(title='No data available. Fetch data to see the graph.')
@@ -12,66 +76,54 @@ def create_tickets_opened_chart(data: pd.DataFrame):
     # TODO error handling
 
 
-    # Process data for the chart
-    # start_date = pd.to_datetime(start_date)
-    # end_date = pd.to_datetime(end_date)
-    data['Created Date'] = pd.to_datetime(data['Created Date'])
-    tickets_per_day = data.groupby([data['Created Date'].dt.date, 'Priority']).size().reset_index(name='Count')
-    tickets_per_day.rename(columns={'Created Date': 'Date'}, inplace=True)
+    # Aggregates memoized per dataset and filter state (see services.memo_service)
+    tickets_per_day = memoized('tickets-opened', cache_key, lambda: tickets_per_day_counts(data))
+    if tickets_per_day.empty:
+        return px.bar(title='No tickets')
 
-    # Filter data based on selected priorities and date range
-    tickets_per_day['Date'] = pd.to_datetime(tickets_per_day['Date'])
-    # filtered_tickets = tickets_per_day[
-    #     (tickets_per_day['Priority'].isin(selected_priorities)) &
-    #     (tickets_per_day['Date'] >= start_date) &
-    #     (tickets_per_day['Date'] <= end_date)
-    # ]
-    filtered_tickets = tickets_per_day
-
-    start_date = filtered_tickets['Date'].min()
-    end_date = filtered_tickets['Date'].max()
-
-    # Calculate dynamic height based on the number of days in the selected range
-    n_days = (end_date - start_date).days
-    height = (n_days / 250) * 5000
-    try:
-        height = int(height)
-        height = max(600, height)
-    except:
-        height = 600
-
-    # Create the stacked horizontal bar chart
-    fig = px.bar(
-        filtered_tickets,
-        y='Date',
-        x='Count',
-        color='Priority',
-        text='Count',
-        text_auto=True,
-        orientation='h',
-        category_orders={'Priority': ['Highest', 'High', 'Medium', 'Low'][::-1]},  # Order of stacking
-        color_discrete_map={
-            'Highest': '#ff0000',
-            'High': '#ffa500',
-            'Medium': '#ffff00',
-            'Low': '#008000'
-        }
-    )
+    start_date, end_date = date_range or (tickets_per_day['Date'].min(), tickets_per_day['Date'].max())
+    name, period, tick_format = choose_bucket(start_date, end_date)
+    counts = memoized(f'tickets-opened-{name}', cache_key, lambda: bucket_counts(tickets_per_day, period))
+
+    # Buckets overlapping the visible range
+    first_bucket = pd.Period(start_date, period).start_time
+    filtered_tickets = counts[(counts['Date'] >= first_bucket) & (counts['Date'] <= end_date)]
+    n_bars = filtered_tickets['Date'].nunique()
+
+    if n_bars > MAX_BARS:
+        fig = stacked_webgl_chart(filtered_tickets)
+    else:
+        # Create the stacked horizontal bar chart
+        fig = px.bar(
+            filtered_tickets,
+            y='Date',
+            x='Count',
+            color='Priority',
+            text='Count',
+            text_auto=True,
+            orientation='h',
+            category_orders={'Priority': PRIORITY_ORDER},
+            color_discrete_map=PRIORITY_COLORS
+        )
+        fig.update_traces(textposition='inside')  # Ensure text is always visible
 
     # Update layout
     fig.update_layout(
+        title=f'Per {name}',
         xaxis_title='Number of Tickets',
         yaxis_title='Date',
-        yaxis=dict(
-            dtick='D1'  # Set the tick interval to 1 day
-        ),
-        height=height,  # Make the chart tall for scrolling
+        height=max(600, min(n_bars, MAX_BARS) * BAR_HEIGHT),
         margin=dict(l=20, r=20, t=50, b=20),
         legend_title='Priority',
-        barmode='stack'
+        barmode='stack',
+        # Keeps the zoom when the figure is re-aggregated for it
+        uirevision=cache_key,
+        # Lets a click be turned into the issues behind the bar (drill-through)
+        meta={'chart': 'tickets-opened', 'period': period}
     )
+    if date_range:
+        fig.update_yaxes(range=[start_date, end_date])
 
-    fig.update_yaxes(tickformat='%a, %Y-%m-%d')  # Display date in YYYY-MM-DD format
-    fig.update_traces(textposition='inside')  # Ensure text is always visible
+    fig.update_yaxes(tickformat=tick_format)
 
     return fig
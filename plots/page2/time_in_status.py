@@ -0,0 +1,47 @@
+import pandas as pd
+import plotly.express as px
+
+from services.memo_service import memoized
+from services.status_time_service import StatusTimes
+
+# Groupings offered for the chart
+GROUP_BY = ['Status', 'Priority', 'Assignee']
+# Groups shown, most stays first
+MAX_GROUPS = 30
+
+def time_in_status_percentiles(times: StatusTimes, issues: pd.DataFrame, by='Status', row_mask=None) -> pd.DataFrame:
+    """Percentiles of the hours per status stay of the `row_mask` issues, grouped by `by`, most stays first."""
+    stats = times.percentiles(issues, by, row_mask=row_mask)
+    return stats.sort_values(['Count', by], ascending=[False, True]).head(MAX_GROUPS)
+
+def create_time_in_status_chart(times: StatusTimes, issues: pd.DataFrame, cache_key=None, by='Status', row_mask=None):
+    """
+    Time-in-status percentiles from a prebuilt StatusTimes (`issues` is the frame it
+    was built from), for the issue rows selected by `row_mask` (default: all).
+    """
+    # Percentiles memoized per dataset, filter state and grouping (see services.memo_service)
+    stats = memoized(f'time-in-status:{by}', cache_key, lambda: time_in_status_percentiles(times, issues, by, row_mask))
+    if stats.empty:
+        return px.bar(title='No status changes')
+
+    fig = px.bar(
+        stats,
+        x=by,
+        y=['P50 Hours', 'P85 Hours', 'P95 Hours'],
+        barmode='group',
+        hover_data=['Count', 'Mean Hours'],
+        color_discrete_map={
+            'P50 Hours': '#93c47d',
+            'P85 Hours': '#f6b26b',
+            'P95 Hours': '#e06666'
+        }
+    )
+    fig.update_layout(
+        title=f'Hours per status stay by {by} (open issues counted up to now)',
+        xaxis_title=by,
+        yaxis_title='Hours',
+        legend_title='Percentile',
+        height=600,
+        margin=dict(l=20, r=20, t=50, b=20)
+    )
+    return fig
@@ -0,0 +1,29 @@
+import pandas as pd
+import plotly.express as px
+
+from services.flow_service import CumulativeFlow
+
+def stacking_order(flow: CumulativeFlow) -> list:
+    """Statuses by the mean day issues enter them, latest first: finished work ends up at the bottom."""
+    entered = flow.deltas[flow.deltas['Delta'] > 0]
+    mean_day = (entered['Date'] - entered['Date'].min()).dt.days.mul(entered['Delta']).groupby(entered['Status']).sum() \
+        / entered.groupby('Status')['Delta'].sum()
+    return list(mean_day.sort_values(ascending=False).index)
+
+def create_cumulative_flow_chart(flow: CumulativeFlow):
+    counts = flow.daily(pd.Timestamp.now().normalize())
+    if counts.empty:
+        return px.area(title='No issues')
+
+    order = [status for status in stacking_order(flow) if status in counts.columns]
+    fig = px.area(counts[order], x=counts.index, y=order)
+    fig.update_traces(line=dict(width=0.5))
+    fig.update_layout(
+        xaxis_title='Date',
+        yaxis_title='Issues',
+        legend_title='Status',
+        height=600,
+        margin=dict(l=20, r=20, t=50, b=20),
+        hovermode='x unified'
+    )
+    return fig
@@ -0,0 +1,39 @@
+import pandas as pd
+import plotly.express as px
+
+from services.interval_service import IntervalIndex
+
+# Bars sent to the browser at most; whole issues, most recently active first
+MAX_GANTT_BARS = 400
+# Pixels per issue row; the chart is at least 400 px tall
+ROW_HEIGHT = 20
+
+def create_gantt_chart(index: IntervalIndex, issues: pd.DataFrame, person=None, start=None, end=None, row_mask=None):
+    """Status timeline of the issues `person` touched (everyone's if None) between `start` and `end`."""
+    positions = index.query(person, start, end, row_mask)
+    positions, shown, total = index.capped(positions, MAX_GANTT_BARS)
+    if not total:
+        return px.bar(title='No issues in this range')
+
+    intervals = index.frame(positions, issues)
+    fig = px.timeline(
+        intervals,
+        x_start='Start',
+        x_end='Finish',
+        y='JIRA Key',
+        color='Status',
+        hover_data={'Current': True}
+    )
+    fig.update_yaxes(autorange='reversed', title=None)  # Most recently active issue on top
+    title = f"{person or 'Everyone'}: {total} issues"
+    if shown < total:
+        title += f" (showing the {shown} most recently active)"
+    fig.update_layout(
+        title=title,
+        height=max(400, shown * ROW_HEIGHT),
+        margin=dict(l=20, r=20, t=50, b=20),
+        legend_title='Status'
+    )
+    if start is not None or end is not None:
+        fig.update_xaxes(range=[start, end])
+    return fig
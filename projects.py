@@ -4,3 +4,13 @@ PROJECTS = {
     "Placeholder 2": "https://unisysbes.atlassian.net",
     "Load from local file": "local"
 }
+
+# Jira sources the app can fetch, several at once: label -> server, JQL and the cache
+# dataset the source is kept (and incrementally synced) in. Labels tag the merged issues.
+JIRA_SOURCES = {
+    "UAT Release 0.12": {
+        "server": "https://unisysbes.atlassian.net",
+        "jql": 'project = UAT AND issuetype = Bug AND affectedversion = "Release 0.12"',
+        "cache": "jira",
+    },
+}
@@ -0,0 +1,184 @@
+import json
+import os
+import re
+import time
+import hashlib
+import threading
+from pathlib import Path
+
+import pandas as pd
+
+from services.changelog_service import encode_events
+
+CACHE_DIR = Path('cache')
+MANIFEST = 'manifest.json'
+# Changelog events of dataset `name` are cached as dataset `name` + EVENTS_SUFFIX
+EVENTS_SUFFIX = '-events'
+
+# Bump when the on-disk layout changes; older caches are then ignored and rebuilt
+CACHE_FORMAT_VERSION = 2
+# Previous versions of each dataset kept next to the current one
+KEEP_VERSIONS = 3
+COMPRESSION = 'zstd'
+
+# Format the Jira pull writes its date columns in
+DATE_FORMAT = '%m/%d/%Y %I:%M %p'
+DATE_COLUMN = re.compile(r'^(Created Date|Updated Date|Changed Date( \d+)?)$')
+
+# Manifest read-modify-writes are serialized: several sources may be saved at once
+_manifest_lock = threading.RLock()
+
+
+def _read_manifest(cache_dir):
+    path = Path(cache_dir) / MANIFEST
+    if not path.exists():
+        return {'format_version': CACHE_FORMAT_VERSION, 'current': None, 'datasets': {}}
+    with open(path) as f:
+        manifest = json.load(f)
+    if manifest.get('format_version') != CACHE_FORMAT_VERSION:
+        print(f"Ignoring cache in '{cache_dir}' written with format version {manifest.get('format_version')}")
+        return {'format_version': CACHE_FORMAT_VERSION, 'current': None, 'datasets': {}}
+    return manifest
+
+
+def _write_manifest(manifest, cache_dir):
+    path = Path(cache_dir) / MANIFEST
+    tmp = path.with_suffix('.tmp')
+    with open(tmp, 'w') as f:
+        json.dump(manifest, f, indent=4)
+    os.replace(tmp, path)
+
+
+def to_storable(df: pd.DataFrame) -> pd.DataFrame:
+    """Give the columns proper types: parse date columns, stringify stray objects (e.g. jira Resources)."""
+    df = df.copy()
+    for col in df.columns:
+        series = df[col]
+        if DATE_COLUMN.match(str(col)) and not pd.api.types.is_datetime64_any_dtype(series):
+            df[col] = pd.to_datetime(series, format=DATE_FORMAT, errors='coerce')
+            # Fall back to free-form parsing for files that were not written by our pull
+            if df[col].isna().sum() > series.isna().sum():
+                df[col] = pd.to_datetime(series, errors='coerce')
+        elif series.dtype == object:
+            df[col] = series.map(lambda value: value if value is None or isinstance(value, str) or pd.isna(value) else str(value))
+    return df
+
+
+def content_hash(df: pd.DataFrame) -> str:
+    """Stable hash of a frame's values, column names and order."""
+    digest = hashlib.sha1(pd.util.hash_pandas_object(df, index=False).values.tobytes())
+    digest.update('\x1f'.join(map(str, df.columns)).encode())
+    return digest.hexdigest()
+
+
+def save_dataset(df: pd.DataFrame, name: str='jira', cache_dir=CACHE_DIR, make_current: bool=True, extra: dict=None) -> dict:
+    """
+    Write `df` as a new compressed Parquet version of dataset `name`.
+
+    Returns the dataset's manifest entry: version, content hash, rows, path...
+    plus the `extra` fields, if given.
+    """
+    start = time.perf_counter()
+    cache_dir = Path(cache_dir)
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    manifest = _read_manifest(cache_dir)
+
+    df = to_storable(df)
+    previous = manifest['datasets'].get(name, {})
+    version = previous.get('version', 0) + 1
+    path = cache_dir / f'{name}.v{version}.parquet'
+    tmp = path.with_suffix('.tmp')
+    df.to_parquet(tmp, compression=COMPRESSION, index=False)
+    os.replace(tmp, path)
+
+    entry = {
+        'version': version,
+        'file': path.name,
+        'content_hash': content_hash(df),
+        'rows': len(df),
+        'columns': len(df.columns),
+        'saved_at': time.time(),
+        'history': [*previous.get('history', []), path.name][-KEEP_VERSIONS:],
+        **(extra or {}),
+    }
+    for stale in set(previous.get('history', [])) - set(entry['history']):
+        (cache_dir / stale).unlink(missing_ok=True)
+
+    with _manifest_lock:
+        manifest = _read_manifest(cache_dir)
+        manifest['datasets'][name] = entry
+        if make_current:
+            manifest['current'] = name
+        _write_manifest(manifest, cache_dir)
+    print(f"Cached dataset '{name}' v{version} ({len(df)} rows) in {time.perf_counter() - start:.3f}s")
+    return entry
+
+
+def current_name(cache_dir=CACHE_DIR):
+    """Name of the current dataset, or None if nothing is cached."""
+    return _read_manifest(cache_dir)['current']
+
+
+def dataset_meta(name: str=None, cache_dir=CACHE_DIR):
+    """Manifest entry of dataset `name` (default: the current one), or None."""
+    manifest = _read_manifest(cache_dir)
+    name = name or manifest['current']
+    return manifest['datasets'].get(name) if name else None
+
+
+def load_dataset(name: str=None, cache_dir=CACHE_DIR, version: int=None):
+    """Read dataset `name` (default: the current one) from the cache, or None if it is not cached."""
+    start = time.perf_counter()
+    meta = dataset_meta(name, cache_dir)
+    if meta is None:
+        return None
+    file = meta['file'] if version is None else meta['file'].replace(f".v{meta['version']}.", f".v{version}.")
+    path = Path(cache_dir) / file
+    if not path.exists():
+        return None
+    df = pd.read_parquet(path)
+    print(f"Loaded '{file}' ({len(df)} rows) from cache in {time.perf_counter() - start:.3f}s")
+    return df
+
+
+def save_tables(issues: pd.DataFrame, events: pd.DataFrame, name: str='jira', cache_dir=CACHE_DIR, make_current: bool=True) -> dict:
+    """Cache an (issues, events) pair; the events first, so the current dataset always has both."""
+    save_dataset(events, name + EVENTS_SUFFIX, cache_dir, make_current=False)
+    return save_dataset(issues, name, cache_dir, make_current)
+
+
+def load_tables(name: str=None, cache_dir=CACHE_DIR):
+    """Read the (issues, events) pair of dataset `name` (default: the current one), or None."""
+    name = name or current_name(cache_dir)
+    if name is None:
+        return None
+    issues = load_dataset(name, cache_dir)
+    events = load_dataset(name + EVENTS_SUFFIX, cache_dir)
+    if issues is None or events is None:
+        return None
+    return issues, encode_events(events)
+
+
+def set_current(name: str, cache_dir=CACHE_DIR):
+    with _manifest_lock:
+        manifest = _read_manifest(cache_dir)
+        if name in manifest['datasets']:
+            manifest['current'] = name
+            _write_manifest(manifest, cache_dir)
+
+
+def drop_timezones(df: pd.DataFrame) -> pd.DataFrame:
+    """Timezone-aware columns as naive wall-clock times (for Excel and JSON, which would shift them to UTC)."""
+    columns = df.select_dtypes(include=['datetimetz']).columns
+    if len(columns) == 0:
+        return df
+    df = df.copy()
+    for col in columns:
+        df[col] = df[col].dt.tz_localize(None)
+    return df
+
+
+def export_excel(df: pd.DataFrame, path='JIRA_Complete_Data.xlsx'):
+    """Optional Excel export of a dataset; the app itself never reads this back."""
+    drop_timezones(df).to_excel(path, index=False)
+    print(f"The file '{path}' has been updated.")
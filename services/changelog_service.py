@@ -0,0 +1,78 @@
+import re
+
+import pandas as pd
+
+# One row per status transition, joined back to the issues on `JIRA Key`
+EVENT_COLUMNS = ['JIRA Key', 'Seq', 'Old Status', 'New Status', 'Changed By', 'Changed Date', 'Time In Status']
+# String columns stored dictionary-encoded (pandas categoricals / Parquet dictionaries)
+CATEGORICAL_COLUMNS = ['JIRA Key', 'Old Status', 'New Status', 'Changed By']
+
+# Legacy wide layout: `Time In Status i` (`Time in Status 1` in older pulls), `Old Status i`, ...
+WIDE_COLUMN = re.compile(r'^(Time In Status|Old Status|New Status|Changed By|Changed Date) (\d+)$', re.IGNORECASE)
+WIDE_FIELDS = {'time in status': 'Time In Status', 'old status': 'Old Status', 'new status': 'New Status',
+               'changed by': 'Changed By', 'changed date': 'Changed Date'}
+
+
+def encode_events(events: pd.DataFrame) -> pd.DataFrame:
+    """Put an event frame in canonical column order and dtypes."""
+    events = events.reindex(columns=EVENT_COLUMNS)
+    for col in CATEGORICAL_COLUMNS:
+        events[col] = events[col].astype('category')
+    events['Seq'] = events['Seq'].astype('int32')
+    events['Changed Date'] = pd.to_datetime(events['Changed Date'], errors='coerce')
+    events['Time In Status'] = events['Time In Status'].astype('float32')
+    return events.reset_index(drop=True)
+
+
+def empty_events() -> pd.DataFrame:
+    return encode_events(pd.DataFrame(columns=EVENT_COLUMNS))
+
+
+def wide_columns(df: pd.DataFrame) -> list:
+    """The numbered changelog columns of a wide-layout frame."""
+    return [col for col in df.columns if WIDE_COLUMN.match(str(col))]
+
+
+def split_wide(df: pd.DataFrame):
+    """
+    Split a wide-layout frame (e.g. an old Excel export) into (issues, events).
+
+    Frames without numbered changelog columns come back unchanged, with no events.
+    """
+    columns = wide_columns(df)
+    issues = df.drop(columns=columns)
+    if not columns:
+        return issues, empty_events()
+
+    parts = []
+    for col in columns:
+        field, seq = WIDE_COLUMN.match(str(col)).groups()
+        part = df[['JIRA Key', col]].rename(columns={col: 'value'})
+        part['field'] = WIDE_FIELDS[field.lower()]
+        part['Seq'] = int(seq)
+        parts.append(part.dropna(subset=['value']))
+    long = pd.concat(parts, ignore_index=True)
+    events = long.groupby(['JIRA Key', 'Seq', 'field'], sort=False)['value'].first().unstack('field').reset_index()
+    events.columns.name = None
+    # Keep the issues' order, then transition order within each issue
+    issue_order = pd.Series(range(len(issues)), index=issues['JIRA Key'].values)
+    issue_order = issue_order[~issue_order.index.duplicated()]
+    events['_order'] = events['JIRA Key'].map(issue_order)
+    events = events.sort_values(['_order', 'Seq'], kind='stable').drop(columns='_order')
+    return issues, encode_events(events)
+
+
+def to_wide(issues: pd.DataFrame, events: pd.DataFrame) -> pd.DataFrame:
+    """Derive the legacy wide layout (one set of numbered columns per transition)."""
+    if events.empty:
+        return issues.copy()
+    wide = events.astype({col: object for col in CATEGORICAL_COLUMNS}).pivot(index='JIRA Key', columns='Seq')
+    fields = ['Time In Status', 'Old Status', 'New Status', 'Changed By', 'Changed Date']
+    wide = wide[[(field, seq) for seq in sorted(events['Seq'].unique()) for field in fields]]
+    wide.columns = [f'{field} {seq}' for field, seq in wide.columns]
+    return issues.merge(wide, how='left', left_on='JIRA Key', right_index=True)
+
+
+def events_for(issues: pd.DataFrame, events: pd.DataFrame) -> pd.DataFrame:
+    """The events belonging to the issues in `issues`."""
+    return events[events['JIRA Key'].isin(issues['JIRA Key'])]
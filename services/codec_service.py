@@ -0,0 +1,57 @@
+import io
+import os
+import base64
+
+import pandas as pd
+import pyarrow as pa
+
+from services.cache_service import drop_timezones
+
+# Codec used for frames that travel through a dcc.Store (see `encode_frames`)
+STORE_CODEC = os.getenv('STORE_CODEC', 'arrow')
+# Arrow IPC buffer compression: 'zstd', 'lz4' or 'none'
+ARROW_COMPRESSION = os.getenv('STORE_COMPRESSION', 'zstd')
+
+
+def arrow_encode(df: pd.DataFrame) -> bytes:
+    """Arrow IPC stream of `df`; keeps dtypes (categoricals, tz-aware datetimes) exactly."""
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    compression = None if ARROW_COMPRESSION == 'none' else ARROW_COMPRESSION
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema, options=pa.ipc.IpcWriteOptions(compression=compression)) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+
+def arrow_decode(data: bytes) -> pd.DataFrame:
+    return pa.ipc.open_stream(pa.py_buffer(data)).read_all().to_pandas()
+
+
+def json_encode(df: pd.DataFrame) -> bytes:
+    """The old `to_json(orient='split')` payload; dates come back as naive wall-clock times."""
+    return drop_timezones(df).to_json(date_format='iso', orient='split').encode()
+
+
+def json_decode(data: bytes) -> pd.DataFrame:
+    return pd.read_json(io.StringIO(data.decode()), orient='split')
+
+
+# name -> (encode, decode); register other codecs here
+CODECS = {
+    'arrow': (arrow_encode, arrow_decode),
+    'json': (json_encode, json_decode),
+}
+
+
+def encode_frames(frames: dict, codec: str=None) -> dict:
+    """Serialize named frames into a JSON-safe dict (base64 payloads) for a dcc.Store."""
+    codec = codec or STORE_CODEC
+    encode, _ = CODECS[codec]
+    return {'codec': codec,
+            'frames': {name: base64.b64encode(encode(df)).decode('ascii') for name, df in frames.items()}}
+
+
+def decode_frames(payload: dict) -> dict:
+    """Inverse of `encode_frames`."""
+    _, decode = CODECS[payload['codec']]
+    return {name: decode(base64.b64decode(data)) for name, data in payload['frames'].items()}
@@ -1,9 +1,78 @@
+import os
 import json
+import threading
 from pathlib import Path
 
 FILE = Path(__file__).parent.parent / 'config' / 'filters_config.json'
 
-# Load the filter configuration from the JSON file
+# Filter types the sidebar knows how to render
+FILTER_TYPES = ('dropdown', 'date', 'numeric')
+
+
+class FilterConfigError(ValueError):
+    """The filter configuration file does not match the expected layout."""
+
+
+def validate_filter_config(config, source=FILE):
+    """Check a parsed filter config; raises FilterConfigError listing every problem found."""
+    problems = []
+    filters = config.get('filters') if isinstance(config, dict) else None
+    if not isinstance(filters, list):
+        problems.append("top level must be an object with a 'filters' list")
+        filters = []
+    columns = set()
+    for i, filter_item in enumerate(filters):
+        if not isinstance(filter_item, dict):
+            problems.append(f"filters[{i}] must be an object")
+            continue
+        column = filter_item.get('column')
+        if not isinstance(column, str) or not column:
+            problems.append(f"filters[{i}].column must be a non-empty string")
+        elif column in columns:
+            problems.append(f"filters[{i}].column '{column}' is listed twice")
+        columns.add(column)
+        if filter_item.get('filter_type') not in FILTER_TYPES:
+            problems.append(f"filters[{i}].filter_type {filter_item.get('filter_type')!r} is not one of {', '.join(FILTER_TYPES)}")
+    if problems:
+        raise FilterConfigError(f"Invalid filter config '{source}':\n  " + '\n  '.join(problems))
+    return config
+
+
+# path -> (mtime_ns last seen, parsed config, mtime_ns of the file that config came from)
+_cache = {}
+_lock = threading.Lock()
+
+
 def load_filter_config(config_file=FILE):
-    with open(config_file) as f:
-        return json.load(f)
+    """
+    The parsed and validated filter configuration.
+
+    Cached per file and only re-read when the file's mtime changes. If an edited
+    file fails to parse or validate, the error is printed and the last good
+    config stays in use; on first load the error is raised.
+    """
+    path = Path(config_file)
+    mtime = os.stat(path).st_mtime_ns
+    with _lock:
+        cached = _cache.get(path)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+        try:
+            with open(path) as f:
+                config = validate_filter_config(json.load(f), path)
+        except (ValueError, OSError) as err:
+            if cached is None:
+                raise
+            print(f"Keeping the previous filter config: {err}")
+            _cache[path] = (mtime, cached[1], cached[2])
+            return cached[1]
+        if cached is not None:
+            print(f"Reloaded filter config '{path}'")
+        _cache[path] = (mtime, config, mtime)
+        return config
+
+
+def filter_config_version(config_file=FILE):
+    """Changes whenever a new filter config is loaded; lets the app notice edits and rebuild the sidebar."""
+    load_filter_config(config_file)
+    return _cache[Path(config_file)][2]
@@ -0,0 +1,105 @@
+import re
+
+import numpy as np
+import pandas as pd
+
+# Issue columns shown in the drill-through table, if present
+TABLE_COLUMNS = ['JIRA Key', 'Created Date', 'Priority', 'Status', 'Assignee', 'Display Name', 'Resolution',
+                 'Severity', 'Updated Date']
+TABLE_DATE_FORMAT = '%Y-%m-%d %H:%M'
+
+# One DataTable filter_query term: {column} operator value
+FILTER_TERM = re.compile(r'^\{(?P<column>[^}]+)\}\s*(?P<op>scontains|icontains|contains|s=|i=|=|eq|!=|ne|>=|ge|<=|le|>|gt|<|lt)\s*(?P<value>.+)$')
+OPERATORS = {'eq': '=', 'ne': '!=', 'ge': '>=', 'le': '<=', 'gt': '>', 'lt': '<', 's=': '=', 'i=': '=',
+             'scontains': 'contains', 'icontains': 'contains'}
+
+
+def selection_mask(issues: pd.DataFrame, events: pd.DataFrame, selection: dict) -> np.ndarray:
+    """
+    Rows of `issues` behind a clicked chart element.
+
+    `selection` is {'chart': 'tickets-opened', 'date', 'period', 'priority'} for a
+    (bucket, priority) bar, or {'chart': 'assignee-contributor', 'people', 'count',
+    'exclude'} for a person's Assignee or Contributor Count bar; "Others" is
+    everyone but the `people` on the page (`exclude`).
+    """
+    if selection['chart'] == 'tickets-opened':
+        created = pd.to_datetime(issues['Created Date'])
+        if created.dt.tz is not None:
+            created = created.dt.tz_localize(None)
+        bucket = pd.Period(selection['date'], selection['period'])
+        mask = ((created >= bucket.start_time) & (created <= bucket.end_time)).to_numpy()
+        if selection.get('priority') is not None:
+            mask &= (issues['Priority'].astype(object) == selection['priority']).to_numpy()
+        return mask
+
+    people = set(selection['people'])
+    exclude = selection.get('exclude', False)
+    if selection['count'] == 'Assignee Count':
+        assignee = issues['Assignee'].astype(object)
+        return ((assignee.isin(people) != exclude) & assignee.notna()).to_numpy()
+    # Contributor Count: a status changed by the person, on an issue assigned to someone else
+    changes = events[['JIRA Key', 'Changed By']].astype(object).drop_duplicates()
+    changes = changes[(changes['Changed By'].isin(people) != exclude) & changes['Changed By'].notna()]
+    changes = changes.merge(issues[['JIRA Key', 'Assignee']].astype(object), on='JIRA Key', how='left')
+    keys = changes.loc[changes['Changed By'] != changes['Assignee'], 'JIRA Key']
+    return issues['JIRA Key'].astype(object).isin(keys).to_numpy()
+
+
+def _filter_term(df: pd.DataFrame, term: str):
+    """Mask of one `{column} op value` term, or None if it cannot be applied."""
+    match = FILTER_TERM.match(term.strip())
+    if match is None or match['column'] not in df:
+        return None
+    column, op, value = df[match['column']], OPERATORS.get(match['op'], match['op']), match['value'].strip()
+    if len(value) > 1 and value[0] == value[-1] and value[0] in '"\'`':
+        value = value[1:-1]
+    if op == 'contains':
+        return column.astype(str).str.contains(value, case=False, regex=False, na=False).to_numpy()
+    if pd.api.types.is_datetime64_any_dtype(column):
+        column = column.dt.tz_localize(None) if column.dt.tz is not None else column
+        value = pd.to_datetime(value, errors='coerce')
+    elif pd.api.types.is_numeric_dtype(column):
+        value = pd.to_numeric(value, errors='coerce')
+    else:
+        column = column.astype(str)
+    if pd.isna(value):
+        return None
+    compare = {'=': column.__eq__, '!=': column.__ne__, '>=': column.__ge__, '<=': column.__le__,
+               '>': column.__gt__, '<': column.__lt__}[op]
+    return compare(value).fillna(False).to_numpy(dtype=bool)
+
+
+def apply_filter_query(df: pd.DataFrame, filter_query: str) -> pd.DataFrame:
+    """Rows of `df` matching a DataTable `filter_query` (terms joined by `&&`; terms it cannot parse are ignored)."""
+    if not filter_query:
+        return df
+    mask = np.ones(len(df), dtype=bool)
+    for term in filter_query.split(' && '):
+        term_mask = _filter_term(df, term)
+        if term_mask is not None:
+            mask &= term_mask
+    return df[mask]
+
+
+def table_page(issues: pd.DataFrame, mask, page: int, page_size: int, sort_by=None, filter_query=''):
+    """
+    (records of one table page, page count, matching rows).
+
+    Only the selected rows are filtered and sorted (`sort_by` as DataTable's
+    [{'column_id', 'direction'}]); only the requested page is formatted.
+    """
+    columns = [col for col in TABLE_COLUMNS if col in issues]
+    rows = apply_filter_query(issues.loc[mask, columns], filter_query)
+    sort_by = [item for item in sort_by or [] if item['column_id'] in rows]
+    if sort_by:
+        rows = rows.sort_values([item['column_id'] for item in sort_by],
+                                ascending=[item['direction'] == 'asc' for item in sort_by], kind='stable')
+    page_count = max(1, -(-len(rows) // page_size))
+    shown = rows.iloc[page * page_size:(page + 1) * page_size].copy()
+    for col in shown.columns:
+        if pd.api.types.is_datetime64_any_dtype(shown[col]):
+            shown[col] = shown[col].dt.strftime(TABLE_DATE_FORMAT)
+        else:
+            shown[col] = shown[col].astype(object).where(shown[col].notna(), None)
+    return shown.to_dict('records'), page_count, len(rows)
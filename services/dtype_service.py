@@ -0,0 +1,59 @@
+import pandas as pd
+
+# Columns sharing one category dictionary: the same people / statuses appear in all of them.
+# ('issues' | 'events', column)
+SHARED_CATEGORIES = {
+    'person': [('issues', 'Assignee'), ('issues', 'Display Name'), ('events', 'Changed By')],
+    'status': [('issues', 'Status'), ('events', 'Old Status'), ('events', 'New Status')],
+}
+# Other low-cardinality issue columns, each with its own categories
+CATEGORICAL_COLUMNS = ['Priority', 'Resolution', 'Environment', 'Root Cause', 'Severity', 'Source']
+# Hour durations; float32 keeps ~7 significant digits, plenty for hours
+HOUR_COLUMNS = ['Time In Status']
+# Columns with more distinct values than this fraction of their rows are left as objects
+MAX_DISTINCT_RATIO = 0.5
+
+
+def frame_mb(df: pd.DataFrame) -> float:
+    return df.memory_usage(deep=True).sum() / 1e6
+
+
+def _low_cardinality(series: pd.Series) -> bool:
+    return len(series) > 0 and series.nunique(dropna=True) <= MAX_DISTINCT_RATIO * len(series)
+
+
+def compact_tables(issues: pd.DataFrame, events: pd.DataFrame, report: bool=True):
+    """
+    Low-cardinality string columns as categoricals and hour durations as float32.
+
+    Columns in one SHARED_CATEGORIES group get the same (sorted) categories, so
+    their codes are comparable and the dictionary is held once per group.
+    Prints memory before and after unless `report` is False.
+    """
+    before = frame_mb(issues) + frame_mb(events)
+    frames = {'issues': issues.copy(), 'events': events.copy()}
+
+    for members in SHARED_CATEGORIES.values():
+        present = [(frame, col) for frame, col in members if col in frames[frame]]
+        if not present:
+            continue
+        values = set()
+        for frame, col in present:
+            series = frames[frame][col]
+            values.update(series.cat.categories if isinstance(series.dtype, pd.CategoricalDtype) else series.dropna().unique())
+        dtype = pd.CategoricalDtype(sorted(values, key=str))
+        for frame, col in present:
+            frames[frame][col] = frames[frame][col].astype(dtype)
+
+    issues, events = frames['issues'], frames['events']
+    for col in CATEGORICAL_COLUMNS:
+        if col in issues and issues[col].dtype == object and _low_cardinality(issues[col]):
+            issues[col] = issues[col].astype('category')
+    for col in HOUR_COLUMNS:
+        if col in events:
+            events[col] = events[col].astype('float32')
+
+    if report:
+        after = frame_mb(issues) + frame_mb(events)
+        print(f"Compacted {len(issues)} issues / {len(events)} events: {before:.1f} MB -> {after:.1f} MB")
+    return issues, events
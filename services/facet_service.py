@@ -0,0 +1,157 @@
+import sys
+
+import numpy as np
+import pandas as pd
+
+from services.person_service import PersonIndex
+
+# Sidebar filter backed by the PersonIndex instead of an issue column
+PERSON_FILTER = 'Person'
+# Longest n-gram kept in the search index; longer queries intersect their n-grams
+SEARCH_GRAM = 3
+
+
+def strings_nbytes(values) -> int:
+    """Approximate memory of a list of strings: the list itself plus every string object."""
+    return sys.getsizeof(values) + sum(sys.getsizeof(value) for value in values)
+
+
+class SearchIndex:
+    """
+    Case-folded n-gram index over a sorted list of option values.
+
+    Every substring of up to SEARCH_GRAM characters maps to the positions of the
+    values containing it, so a search touches only candidate values instead of
+    scanning (and lower-casing) the whole list per keystroke.
+    """
+
+    def __init__(self, values):
+        self.values = list(values)
+        self.folded = [str(value).casefold() for value in self.values]
+        grams, positions = [], []
+        for i, text in enumerate(self.folded):
+            text_grams = {text[start:start + n] for n in range(1, SEARCH_GRAM + 1) for start in range(len(text) - n + 1)}
+            grams.extend(text_grams)
+            positions.extend([i] * len(text_grams))
+        # Postings as flat arrays (like PersonIndex): sorted distinct grams, and the value
+        # positions of grams[k] at positions[offsets[k]:offsets[k + 1]], ascending
+        grams = np.array(grams, dtype=f'<U{SEARCH_GRAM}')
+        order = np.argsort(grams, kind='stable')
+        self.grams, starts = np.unique(grams[order], return_index=True)
+        self.positions = np.array(positions, dtype=np.int32)[order]
+        self.offsets = np.append(starts, len(order)).astype(np.int64)
+        self.nbytes = (self.grams.nbytes + self.positions.nbytes + self.offsets.nbytes
+                       + strings_nbytes(self.values) + strings_nbytes(self.folded))
+
+    def _postings(self, gram):
+        """Positions of the values containing `gram` (at most SEARCH_GRAM characters)."""
+        k = np.searchsorted(self.grams, gram)
+        if k == len(self.grams) or self.grams[k] != gram:
+            return self.positions[:0]
+        return self.positions[self.offsets[k]:self.offsets[k + 1]]
+
+    def search(self, query) -> list:
+        """Values containing `query` (case-insensitive), in sorted order; all values for an empty query."""
+        query = (query or '').casefold()
+        if not query:
+            return self.values
+        if len(query) <= SEARCH_GRAM:
+            return [self.values[i] for i in self._postings(query)]
+        grams = sorted((self._postings(query[start:start + SEARCH_GRAM])
+                        for start in range(len(query) - SEARCH_GRAM + 1)), key=len)
+        candidates = grams[0]
+        for positions in grams[1:]:
+            if not len(candidates):
+                break
+            candidates = np.intersect1d(candidates, positions, assume_unique=True)
+        return [self.values[i] for i in candidates if query in self.folded[i]]
+
+
+class FilterEngine:
+    """
+    Precomputed sidebar filters over one issues frame.
+
+    Every filter column is dictionary-encoded once (value -> int code, values
+    compared as strings, like the sidebar's checkbox values), so a selection
+    becomes a lookup-table gather instead of `isin` on the raw column.
+    `evaluate` returns the combined row mask together with facet counts.
+    """
+
+    def __init__(self, issues: pd.DataFrame, events: pd.DataFrame, columns, person_index: PersonIndex=None):
+        self.n_rows = len(issues)
+        self.columns = list(columns)
+        self.codes = {}
+        self.values = {}
+        self.ids = {}
+        for column in self.columns:
+            if column == PERSON_FILTER:
+                self.person_index = person_index or PersonIndex(issues, events)
+                self.values[column] = self.person_index.names
+            else:
+                series = issues[column]
+                codes, values = pd.factorize(series.astype(str).where(series.notna()), sort=True)
+                self.codes[column] = codes.astype(np.int32)
+                self.values[column] = list(values)
+            self.ids[column] = {value: i for i, value in enumerate(self.values[column])}
+        # Facet dictionary for the sidebar search boxes
+        self.search_index = {column: SearchIndex(self.values[column]) for column in self.columns}
+        # The value -> code dicts hold the same strings as `values` (counted by the search index)
+        self.nbytes = (sum(codes.nbytes for codes in self.codes.values())
+                       + sum(index.nbytes for index in self.search_index.values())
+                       + sum(sys.getsizeof(ids) for ids in self.ids.values()))
+
+    def search(self, column, query) -> list:
+        """Distinct values of `column` matching the sidebar search `query`, sorted."""
+        return self.search_index[column].search(query)
+
+    def _mask(self, column, selected):
+        """Row mask of one filter's selection, or None if nothing is selected (no restriction)."""
+        if not selected:
+            return None
+        if column == PERSON_FILTER:
+            return self.person_index.mask(selected)
+        lookup = np.zeros(len(self.values[column]) + 1, dtype=bool)  # code -1 (missing) -> last, False
+        lookup[[self.ids[column][value] for value in map(str, selected) if value in self.ids[column]]] = True
+        return lookup[self.codes[column]]
+
+    def _counts(self, column, mask):
+        """Rows under `mask` per value of `column`."""
+        if column == PERSON_FILTER:
+            index = self.person_index
+            seen = np.concatenate([[0], np.cumsum(mask[index.rows])])
+            return seen[index.offsets[1:]] - seen[index.offsets[:-1]]
+        codes = self.codes[column]
+        return np.bincount(codes[mask & (codes >= 0)], minlength=len(self.values[column]))
+
+    def evaluate(self, filter_values):
+        """
+        (row mask, facet counts) for the sidebar selections, in `columns` order.
+
+        Selections within a filter are OR-ed, filters are AND-ed. A Person
+        selection that would leave no rows is ignored. The counts of each
+        filter's values are taken under all the *other* filters, so they show
+        what ticking that box would add.
+        """
+        masks = []
+        combined = np.ones(self.n_rows, dtype=bool)
+        for column, selected in zip(self.columns, filter_values):
+            mask = self._mask(column, selected)
+            if mask is not None and column == PERSON_FILTER and not (combined & mask).any():
+                mask = None
+            if mask is not None:
+                combined &= mask
+            masks.append(mask)
+
+        # AND of every other filter's mask, from prefix and suffix ANDs
+        everything = np.ones(self.n_rows, dtype=bool)
+        prefix = [everything]
+        for mask in masks[:-1]:
+            prefix.append(prefix[-1] if mask is None else prefix[-1] & mask)
+        counts = [None] * len(masks)
+        suffix = everything
+        for i in reversed(range(len(masks))):
+            others = prefix[i] & suffix
+            counts[i] = dict(zip(self.values[self.columns[i]], self._counts(self.columns[i], others).tolist()))
+            if masks[i] is not None:
+                suffix = suffix & masks[i]
+        return combined, counts
@@ -0,0 +1,307 @@
+"""
+Offline stand-in for the Jira Cloud REST API (v2), for benchmarks and regression runs.
+
+Serves `search` pages (with `expand=changelog`), `field`, `serverInfo` and the
+paged `issue/{key}/changelog` endpoint from a fixture: either synthetic issues
+generated from a seed, or raw issues recorded from a real instance with
+`record_fixture`. Latency, the server-side page size cap and a 429 rate limit
+are configurable, so the real `JIRA` client in `services.jira_service` can be
+pointed at it:
+
+    python -m services.fake_jira_server --issues 5000 --latency 0.2 --port 8089
+    python -m services.fake_jira_server --issues 5000 --latency 0.2 --bench 1,4,8
+
+and then fetch from `http://127.0.0.1:8089`.
+"""
+
+# Builtin packages
+import re
+import json
+import time
+import random
+import argparse
+import datetime
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlparse, parse_qs
+
+API = '/rest/api/2/'
+
+STATUSES = ['Open', 'In Progress', 'In Review', 'Resolved', 'Closed']
+PRIORITIES = ['Highest', 'High', 'Medium', 'Low']
+ENVIRONMENTS = ['UAT', 'SIT', 'Production']
+ROOT_CAUSES = ['Code', 'Configuration', 'Data', 'Requirement']
+SEVERITIES = ['Critical', 'Major', 'Minor']
+
+# Field metadata as returned by /field; the customfield ids match our Jira site
+FIELDS = [
+    {'id': 'summary', 'name': 'Summary', 'custom': False, 'clauseNames': ['summary']},
+    {'id': 'created', 'name': 'Created', 'custom': False, 'clauseNames': ['created', 'createdDate']},
+    {'id': 'updated', 'name': 'Updated', 'custom': False, 'clauseNames': ['updated', 'updatedDate']},
+    {'id': 'reporter', 'name': 'Reporter', 'custom': False, 'clauseNames': ['reporter']},
+    {'id': 'assignee', 'name': 'Assignee', 'custom': False, 'clauseNames': ['assignee']},
+    {'id': 'priority', 'name': 'Priority', 'custom': False, 'clauseNames': ['priority']},
+    {'id': 'status', 'name': 'Status', 'custom': False, 'clauseNames': ['status']},
+    {'id': 'resolution', 'name': 'Resolution', 'custom': False, 'clauseNames': ['resolution']},
+    {'id': 'environment', 'name': 'Environment', 'custom': False, 'clauseNames': ['environment']},
+    {'id': 'customfield_10063', 'name': 'Root Cause', 'custom': True, 'clauseNames': ['cf[10063]', 'Root Cause']},
+    {'id': 'customfield_10065', 'name': 'Environment', 'custom': True, 'clauseNames': ['cf[10065]', 'Environment']},
+    {'id': 'customfield_10072', 'name': 'Severity', 'custom': True, 'clauseNames': ['cf[10072]', 'Severity']},
+]
+
+
+def _jira_time(dt):
+    return dt.strftime('%Y-%m-%dT%H:%M:%S.000+0000')
+
+
+def generate_issues(n_issues=1000, seed=0, project='UAT', days=730, n_people=40, max_transitions=12):
+    """Synthetic raw issues (as Jira returns them), newest first, histories newest first."""
+    rng = random.Random(seed)
+    now = datetime.datetime(2024, 9, 6, 19, 0)
+    names = [f'Person {i:03d}' for i in range(n_people)]
+    issues = []
+    for i in range(n_issues):
+        created = now - datetime.timedelta(days=days * (i / max(n_issues, 1)), minutes=rng.randint(0, 600))
+        histories = []
+        status = 'Open'
+        changed = created
+        for h in range(rng.randint(0, max_transitions)):
+            changed = changed + datetime.timedelta(hours=rng.expovariate(1 / 36))
+            if changed >= now:
+                break
+            if status in ('Resolved', 'Closed') and rng.random() < 0.7:
+                new_status = 'Open'  # Reopened
+            else:
+                new_status = STATUSES[min(STATUSES.index(status) + 1, len(STATUSES) - 1)]
+            histories.append({
+                'id': str(i * 100 + h),
+                'author': {'displayName': rng.choice(names)},
+                'created': _jira_time(changed),
+                'items': [{'field': 'status', 'fieldtype': 'jira', 'fromString': status, 'toString': new_status}],
+            })
+            status = new_status
+        histories.reverse()
+        key = f'{project}-{n_issues - i}'
+        issues.append({
+            'id': str(10000 + n_issues - i),
+            'key': key,
+            'fields': {
+                'summary': f'Synthetic defect {key}',
+                'created': _jira_time(created),
+                'updated': _jira_time(changed),
+                'reporter': {'displayName': rng.choice(names)},
+                'assignee': {'displayName': rng.choice(names)} if rng.random() > 0.05 else None,
+                'priority': {'name': rng.choices(PRIORITIES, weights=[1, 3, 6, 2])[0]},
+                'status': {'name': status},
+                'resolution': {'name': 'Done'} if status in ('Resolved', 'Closed') else None,
+                'customfield_10065': {'value': rng.choice(ENVIRONMENTS)},
+                'customfield_10063': {'value': rng.choice(ROOT_CAUSES)},
+                'customfield_10072': {'value': rng.choice(SEVERITIES)},
+                # Bulk a real issue carries in fields the dashboard never reads
+                'description': f'Steps to reproduce {key}. ' * 40,
+                'labels': ['uat', 'release-0.12'],
+                **{f'customfield_{10100 + n}': {'self': f'{API}customFieldOption/{n}', 'value': f'Option {n}', 'id': str(n)}
+                   for n in range(25)},
+            },
+            'changelog': {'startAt': 0, 'maxResults': len(histories), 'total': len(histories), 'histories': histories},
+        })
+    return issues
+
+
+def load_fixture(path):
+    with open(path) as f:
+        return json.load(f)['issues']
+
+
+def record_fixture(jira, jql, path, page_size=100):
+    """Save the raw issues (with changelogs) of `jql` from a live `JIRA` client, for replay."""
+    issues = []
+    while True:
+        page = jira.search_issues(jql, startAt=len(issues), maxResults=page_size, expand='changelog', json_result=True)
+        issues.extend(page['issues'])
+        if not page['issues'] or len(issues) >= page['total']:
+            break
+    with open(path, 'w') as f:
+        json.dump({'jql': jql, 'recorded_at': time.time(), 'issues': issues}, f)
+    return len(issues)
+
+
+class FakeJira:
+    """Fixture, behaviour knobs and request counters shared by all handler threads."""
+
+    def __init__(self, issues, latency=0.0, jitter=0.0, page_size=100, changelog_page_size=100, rate_limit=None, seed=0):
+        self.issues = issues
+        self.by_key = {issue['key']: issue for issue in issues}
+        self.latency = latency
+        self.jitter = jitter
+        self.page_size = page_size
+        self.changelog_page_size = changelog_page_size
+        self.rate_limit = rate_limit
+        self.rng = random.Random(seed)
+        self.lock = threading.Lock()
+        self.window_start = time.monotonic()
+        self.window_count = 0
+        self.stats = {'requests': 0, 'throttled': 0, 'bytes': 0}
+
+    def throttled(self):
+        """Fixed one-second window limiter: True once `rate_limit` requests were served this second."""
+        with self.lock:
+            self.stats['requests'] += 1
+            if not self.rate_limit:
+                return False
+            now = time.monotonic()
+            if now - self.window_start >= 1.0:
+                self.window_start, self.window_count = now, 0
+            self.window_count += 1
+            if self.window_count > self.rate_limit:
+                self.stats['throttled'] += 1
+                return True
+            return False
+
+    def delay(self):
+        time.sleep(max(0.0, self.latency + self.rng.uniform(-self.jitter, self.jitter)))
+
+    def matching(self, jql):
+        """The JQL is not evaluated except for `updated >= -Nm` / `key in (...)`, used by delta pulls."""
+        issues = self.issues
+        match = re.search(r'updated\s*>=\s*-(\d+)m', jql or '')
+        if match:
+            since = _jira_time(datetime.datetime.utcnow() - datetime.timedelta(minutes=int(match.group(1))))
+            issues = [issue for issue in issues if issue['fields']['updated'] >= since]
+        match = re.search(r'key\s+in\s*\(([^)]*)\)', jql or '', re.IGNORECASE)
+        if match:
+            keys = {key.strip().strip('"\'') for key in match.group(1).split(',')}
+            issues = [issue for issue in issues if issue['key'] in keys]
+        return issues
+
+    def search(self, params):
+        issues = self.matching(params.get('jql', ''))
+        start = int(params.get('startAt', 0))
+        max_results = min(int(params.get('maxResults', 50)), self.page_size)
+        fields = [f for f in params.get('fields', '*all').split(',') if f]
+        expand = params.get('expand', '')
+        page = [self.project(issue, fields, 'changelog' in expand) for issue in issues[start:start + max_results]]
+        return {'expand': 'schema,names', 'startAt': start, 'maxResults': max_results, 'total': len(issues), 'issues': page}
+
+    def project(self, issue, fields, with_changelog):
+        out = {'id': issue['id'], 'key': issue['key'], 'self': f"{API}issue/{issue['id']}"}
+        if '*all' in fields or '*navigable' in fields:
+            out['fields'] = issue['fields']
+        else:
+            out['fields'] = {name: value for name, value in issue['fields'].items() if name in fields}
+        if with_changelog:
+            # Like Jira, search embeds at most `changelog_page_size` histories (newest first)
+            histories = issue['changelog']['histories']
+            shown = histories[:self.changelog_page_size]
+            out['changelog'] = {'startAt': 0, 'maxResults': len(shown), 'total': len(histories), 'histories': shown}
+        return out
+
+    def changelog(self, key, params):
+        """Paged changelog of one issue; like Jira, this endpoint returns the oldest history first."""
+        histories = list(reversed(self.by_key[key]['changelog']['histories']))
+        start = int(params.get('startAt', 0))
+        max_results = min(int(params.get('maxResults', 100)), self.changelog_page_size)
+        page = histories[start:start + max_results]
+        return {'startAt': start, 'maxResults': max_results, 'total': len(histories),
+                'isLast': start + max_results >= len(histories), 'values': page}
+
+
+def make_handler(fake):
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, format, *args):
+            pass
+
+        def send_json(self, payload, status=200, headers=None):
+            body = json.dumps(payload).encode()
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            for name, value in (headers or {}).items():
+                self.send_header(name, value)
+            self.end_headers()
+            self.wfile.write(body)
+            with fake.lock:
+                fake.stats['bytes'] += len(body)
+
+        def do_GET(self):
+            url = urlparse(self.path)
+            query = parse_qs(url.query)
+            params = {name: values[-1] for name, values in query.items()}
+            # `fields` may be repeated (fields=a&fields=b) as well as comma-separated
+            params['fields'] = ','.join(query.get('fields', ['*all']))
+            path = url.path[len(API):] if url.path.startswith(API) else None
+
+            if fake.throttled():
+                return self.send_json({'errorMessages': ['Rate limit exceeded']}, 429, {'Retry-After': '1'})
+            fake.delay()
+
+            if path == 'serverInfo':
+                return self.send_json({'baseUrl': f'http://{self.headers.get("Host")}', 'version': '1001.0.0',
+                                       'versionNumbers': [1001, 0, 0], 'deploymentType': 'Cloud'})
+            if path == 'field':
+                return self.send_json(FIELDS)
+            if path == 'search':
+                return self.send_json(fake.search(params))
+            match = re.fullmatch(r'issue/([^/]+)/changelog', path or '')
+            if match and match.group(1) in fake.by_key:
+                return self.send_json(fake.changelog(match.group(1), params))
+            return self.send_json({'errorMessages': [f'Not found: {url.path}']}, 404)
+
+    return Handler
+
+
+def start_server(fake, host='127.0.0.1', port=0):
+    """Serve `fake` on a daemon thread; returns (server, base_url). Port 0 picks a free port."""
+    server = ThreadingHTTPServer((host, port), make_handler(fake))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f'http://{host}:{server.server_address[1]}'
+
+
+def bench(url, fake, worker_counts):
+    """Time `pull_from_jira_api` against the fake server for each worker count."""
+    from services.jira_service import pull_from_jira_api
+
+    for workers in worker_counts:
+        before = dict(fake.stats)
+        start = time.perf_counter()
+        issues, events = pull_from_jira_api(url, save_local=False, max_workers=workers)
+        elapsed = time.perf_counter() - start
+        print(f"BENCH workers={workers}: {len(issues)} issues, {len(events)} events in {elapsed:.2f}s "
+              f"({len(issues) / elapsed:.1f} issues/s), {fake.stats['requests'] - before['requests']} requests, "
+              f"{fake.stats['throttled'] - before['throttled']} throttled, "
+              f"{(fake.stats['bytes'] - before['bytes']) / 1e6:.1f} MB")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--fixture', help='JSON file written by record_fixture (default: synthetic issues)')
+    parser.add_argument('--issues', type=int, default=1000, help='number of synthetic issues')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--latency', type=float, default=0.0, help='seconds added to every response')
+    parser.add_argument('--jitter', type=float, default=0.0, help='+/- seconds of random latency')
+    parser.add_argument('--max-transitions', type=int, default=12, help='most status changes per synthetic issue')
+    parser.add_argument('--page-size', type=int, default=100, help='server-side cap on maxResults')
+    parser.add_argument('--rate-limit', type=int, default=None, help='requests per second before answering 429')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8089)
+    parser.add_argument('--bench', help='comma-separated worker counts to benchmark pull_from_jira_api with, then exit')
+    args = parser.parse_args()
+
+    issues = load_fixture(args.fixture) if args.fixture else generate_issues(args.issues, args.seed, max_transitions=args.max_transitions)
+    fake = FakeJira(issues, args.latency, args.jitter, args.page_size, rate_limit=args.rate_limit, seed=args.seed)
+    server, url = start_server(fake, args.host, args.port)
+    print(f"Fake Jira serving {len(issues)} issues at {url}")
+
+    if args.bench:
+        bench(url, fake, [int(workers) for workers in args.bench.split(',')])
+        server.shutdown()
+        return
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,92 @@
+import os
+import json
+import time
+import hashlib
+import threading
+from pathlib import Path
+
+FIELD_CACHE_DIR = Path('cache')
+# Field metadata rarely changes; re-read it from Jira at most this often
+FIELD_CACHE_TTL = 24 * 60 * 60
+
+# Dashboard column -> (Jira field name, key holding the value, custom field?, id if the name is not found).
+# Only these fields are requested from Jira; custom field ids are looked up by name per server.
+FIELD_SPECS = {
+    'Display Name': ('Reporter', 'displayName', False, 'reporter'),
+    'Created Date': ('Created', None, False, 'created'),
+    'Details': ('Summary', None, False, 'summary'),
+    'Priority': ('Priority', 'name', False, 'priority'),
+    'Resolution': ('Resolution', 'name', False, 'resolution'),
+    'Assignee': ('Assignee', 'displayName', False, 'assignee'),
+    'Status': ('Status', 'name', False, 'status'),
+    'Environment': ('Environment', 'value', True, 'customfield_10065'),
+    'Root Cause': ('Root Cause', 'value', True, 'customfield_10063'),
+    'Severity': ('Severity', 'value', True, 'customfield_10072'),
+    'Updated Date': ('Updated', None, False, 'updated'),
+}
+
+
+def _cache_file(server, cache_dir):
+    return Path(cache_dir) / f"fields_{hashlib.sha1(server.encode()).hexdigest()[:12]}.json"
+
+
+def field_cache_ttl() -> int:
+    """JIRA_FIELD_CACHE_TTL (default FIELD_CACHE_TTL), read per call so a `.env` loaded after import applies."""
+    return int(os.getenv('JIRA_FIELD_CACHE_TTL', FIELD_CACHE_TTL))
+
+
+def load_field_metadata(jira, server, cache_dir=FIELD_CACHE_DIR, ttl=None):
+    """`jira.fields()`, cached on disk per server for `ttl` seconds (default `field_cache_ttl()`)."""
+    ttl = field_cache_ttl() if ttl is None else ttl
+    path = _cache_file(server, cache_dir)
+    if path.exists() and time.time() - path.stat().st_mtime < ttl:
+        with open(path) as f:
+            return json.load(f)
+    fields = jira.fields()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # Per-thread temporary file: sources on the same server may refresh it at the same time
+    tmp = path.with_suffix(f'.{threading.get_ident()}.tmp')
+    with open(tmp, 'w') as f:
+        json.dump(fields, f)
+    os.replace(tmp, path)
+    return fields
+
+
+def prime_client_cache(jira, fields):
+    """
+    Seed the client's own name->id field cache from `fields`.
+
+    `JIRA.search_issues` otherwise calls `jira.fields()` itself on first use,
+    which would undo the point of caching the metadata on disk.
+    """
+    cache = {field['id']: field['id'] for field in fields}
+    for field in fields:
+        for name in field.get('clauseNames', []):
+            cache[name] = field['id']
+    jira._fields_cache_value = cache
+
+
+def resolve_fields(fields, specs=FIELD_SPECS):
+    """Map every dashboard column to (Jira field id, value key) using the field metadata."""
+    by_name = {}
+    for field in fields:
+        by_name.setdefault((field['name'], bool(field.get('custom'))), field['id'])
+    resolved = {}
+    for column, (name, value_key, custom, fallback) in specs.items():
+        field_id = by_name.get((name, custom))
+        if field_id is None:
+            print(f"Jira field '{name}' not found in the field metadata, using '{fallback}'")
+            field_id = fallback
+        resolved[column] = (field_id, value_key)
+    return resolved
+
+
+def extract_fields(raw_fields, resolved):
+    """Pull the dashboard columns out of a raw issue's `fields` dict; missing values become None."""
+    row = {}
+    for column, (field_id, value_key) in resolved.items():
+        value = raw_fields.get(field_id)
+        if value_key is not None and value is not None:
+            value = value.get(value_key)
+        row[column] = value
+    return row
@@ -0,0 +1,98 @@
+import time
+
+import pandas as pd
+
+from services.cache_service import CACHE_DIR, dataset_meta, load_dataset, save_dataset
+
+# Daily status deltas of dataset `name` are cached as dataset `name` + FLOW_SUFFIX
+FLOW_SUFFIX = '-flow'
+FLOW_COLUMNS = ['Date', 'Status', 'Delta']
+
+
+def _days(series: pd.Series) -> pd.Series:
+    """Calendar day (in the column's own timezone) of each timestamp."""
+    series = pd.to_datetime(series)
+    if series.dt.tz is not None:
+        series = series.dt.tz_localize(None)
+    return series.dt.floor('D')
+
+
+def flow_deltas(issues: pd.DataFrame, events: pd.DataFrame) -> pd.DataFrame:
+    """
+    Net change in the number of issues per (day, status).
+
+    An issue enters its first status (the `Old Status` of its first transition,
+    or its `Status` if it has none) on its creation day; every transition moves
+    it from `Old Status` to `New Status` on its day. The running sum over days
+    is the cumulative flow. Contributions are additive per issue, so a table can
+    be updated by subtracting one set of issues' deltas and adding another's.
+    """
+    events = events[events['JIRA Key'].isin(issues['JIRA Key'])]
+    first_status = events.drop_duplicates('JIRA Key').set_index('JIRA Key')['Old Status'].astype(object)
+    issue_keys = issues['JIRA Key'].astype(object)
+    initial = issue_keys.map(first_status).fillna(issues['Status'].astype(object))
+
+    parts = [
+        pd.DataFrame({'Date': _days(issues['Created Date']), 'Status': initial, 'Delta': 1}),
+        pd.DataFrame({'Date': _days(events['Changed Date']), 'Status': events['Old Status'].astype(object), 'Delta': -1}),
+        pd.DataFrame({'Date': _days(events['Changed Date']), 'Status': events['New Status'].astype(object), 'Delta': 1}),
+    ]
+    return combine_deltas(parts)
+
+
+def combine_deltas(parts) -> pd.DataFrame:
+    """Sum delta frames per (day, status), dropping days and statuses that net to zero."""
+    deltas = pd.concat(parts, ignore_index=True).dropna(subset=['Date', 'Status'])
+    deltas = deltas.groupby(['Date', 'Status'])['Delta'].sum().reset_index()
+    deltas = deltas[deltas['Delta'] != 0].reset_index(drop=True)
+    deltas['Delta'] = deltas['Delta'].astype('int32')
+    return deltas.reindex(columns=FLOW_COLUMNS)
+
+
+def update_flow(deltas: pd.DataFrame, old_issues, old_events, new_issues, new_events, keys) -> pd.DataFrame:
+    """
+    Replay a sync: the issues in `keys` leave with their old transitions and come back with their new ones.
+
+    Only those issues' rows and transitions are scanned, not every issue's history.
+    """
+    keys = pd.Index(keys)
+    old_issues = old_issues[old_issues['JIRA Key'].isin(keys)]
+    new_issues = new_issues[new_issues['JIRA Key'].isin(keys)]
+    removed = flow_deltas(old_issues, old_events[old_events['JIRA Key'].isin(keys)])
+    removed['Delta'] = -removed['Delta']
+    added = flow_deltas(new_issues, new_events[new_events['JIRA Key'].isin(keys)])
+    return combine_deltas([deltas, removed, added])
+
+
+def save_flow(deltas: pd.DataFrame, name: str, issues_version: int, cache_dir=CACHE_DIR) -> dict:
+    """Cache the deltas of dataset `name`, recording the issues version they belong to."""
+    return save_dataset(deltas, name + FLOW_SUFFIX, cache_dir, make_current=False,
+                        extra={'issues_version': issues_version})
+
+
+def load_flow(name: str, issues_version: int=None, cache_dir=CACHE_DIR):
+    """Cached deltas of dataset `name` (of the given issues version, if one is given), or None."""
+    meta = dataset_meta(name + FLOW_SUFFIX, cache_dir)
+    if meta is None or (issues_version is not None and meta.get('issues_version') != issues_version):
+        return None
+    return load_dataset(name + FLOW_SUFFIX, cache_dir)
+
+
+class CumulativeFlow:
+    """Daily issue counts per status, from a table of daily deltas."""
+
+    def __init__(self, deltas: pd.DataFrame):
+        self.deltas = deltas
+        self.nbytes = int(deltas.memory_usage(deep=True).sum())
+
+    def daily(self, until=None) -> pd.DataFrame:
+        """Issues in each status (columns) at the end of every day (index) up to `until` (default: the last change)."""
+        if self.deltas.empty:
+            return pd.DataFrame()
+        start = time.perf_counter()
+        table = self.deltas.pivot_table(index='Date', columns='Status', values='Delta', aggfunc='sum', fill_value=0)
+        days = pd.date_range(table.index.min(), max(table.index.max(), pd.Timestamp(until or table.index.max())), freq='D')
+        counts = table.reindex(days, fill_value=0).cumsum()
+        counts.index.name = 'Date'
+        print(f"Cumulative flow over {len(days)} days in {time.perf_counter() - start:.3f}s")
+        return counts
@@ -0,0 +1,100 @@
+import numpy as np
+import pandas as pd
+
+from services.person_service import PersonIndex
+from services.status_time_service import StatusTimes
+
+
+class IntervalIndex:
+    """
+    Issue x status intervals (see StatusTimes), indexed by issue and person.
+
+    Intervals are sorted by (issue row, start), so `offsets[r]:offsets[r + 1]`
+    are the intervals of issue row r; the PersonIndex maps a person to their
+    rows. A query for a person and a date range only gathers that person's
+    intervals and tests those for overlap.
+    """
+
+    def __init__(self, issues: pd.DataFrame, events: pd.DataFrame, now=None, person_index: PersonIndex=None):
+        self.n_rows = len(issues)
+        self.tz = getattr(issues['Created Date'].dt, 'tz', None)
+        times = StatusTimes(issues, events, now)
+        order = np.lexsort((times.start, times.rows))
+        self.rows = times.rows[order]
+        self.status = times.status[order]
+        self.start = times.start[order]
+        self.end = times.end[order]
+        self.current = times.current[order]
+        self.statuses = times.statuses
+        self.offsets = np.searchsorted(self.rows, np.arange(self.n_rows + 1))
+        self.person_index = person_index or PersonIndex(issues, events)
+        self.nbytes = (self.rows.nbytes + self.status.nbytes + self.start.nbytes + self.end.nbytes
+                       + self.current.nbytes + self.offsets.nbytes)
+
+    def _ns(self, timestamp) -> int:
+        """ns since the epoch of a timestamp; naive ones are in the issues' timezone."""
+        timestamp = pd.Timestamp(timestamp)
+        if timestamp.tz is None and self.tz is not None:
+            timestamp = timestamp.tz_localize(self.tz)
+        return timestamp.value
+
+    def _for_rows(self, rows) -> np.ndarray:
+        """Positions of all intervals of issue `rows`."""
+        first, last = self.offsets[rows], self.offsets[rows + 1]
+        lengths = last - first
+        # CSR expansion: first[i], first[i] + 1, ..., last[i] - 1 for every row
+        shift = np.repeat(first - np.concatenate([[0], np.cumsum(lengths)[:-1]]), lengths)
+        return shift + np.arange(lengths.sum())
+
+    def query(self, person=None, start=None, end=None, row_mask=None) -> np.ndarray:
+        """
+        Positions of the intervals overlapping [`start`, `end`] (Timestamps, None: open)
+        of the issues `person` touched (None: every issue) and selected by `row_mask`.
+        """
+        rows = self.person_index.rows_for([person]) if person is not None else np.arange(self.n_rows)
+        if row_mask is not None:
+            rows = rows[row_mask[rows]]
+        positions = self._for_rows(rows)
+        overlap = np.ones(len(positions), dtype=bool)
+        if start is not None:
+            overlap &= self.end[positions] >= self._ns(start)
+        if end is not None:
+            overlap &= self.start[positions] <= self._ns(end)
+        return positions[overlap]
+
+    def frame(self, positions, issues: pd.DataFrame) -> pd.DataFrame:
+        """
+        Intervals at `positions` as rows of JIRA Key, Status, Start, Finish, Current.
+
+        Times are in the issues' timezone; `issues` is the frame the index was built from.
+        """
+        start = pd.to_datetime(self.start[positions], utc=True)
+        end = pd.to_datetime(self.end[positions], utc=True)
+        if self.tz is not None:
+            start, end = start.tz_convert(self.tz), end.tz_convert(self.tz)
+        else:
+            start, end = start.tz_localize(None), end.tz_localize(None)
+        return pd.DataFrame({
+            'JIRA Key': issues['JIRA Key'].to_numpy()[self.rows[positions]],
+            'Status': np.asarray(self.statuses, dtype=object)[self.status[positions]],
+            'Start': start,
+            'Finish': end,
+            'Current': self.current[positions],
+        })
+
+    def capped(self, positions, max_bars):
+        """
+        (positions, issues kept, issues in total): whole issues, most recently
+        active first, as long as their intervals fit in `max_bars`.
+        """
+        if not len(positions):
+            return positions, 0, 0
+        rows = self.rows[positions]
+        firsts = np.flatnonzero(np.append(True, rows[1:] != rows[:-1]))
+        counts = np.diff(np.append(firsts, len(positions)))
+        latest = np.maximum.reduceat(self.end[positions], firsts)
+        order = np.argsort(-latest, kind='stable')
+        kept = order[:max(1, np.searchsorted(np.cumsum(counts[order]), max_bars, side='right'))]
+        kept_positions = np.concatenate([positions[firsts[i]:firsts[i] + counts[i]] for i in kept])
+        # An issue with more intervals than max_bars on its own keeps its latest ones
+        return kept_positions[-max_bars:], len(kept), len(firsts)
@@ -3,22 +3,93 @@
 from pathlib import Path
 import time
 import os
-import datetime
-import dateutil.parser
 import math
-from math import floor
+import random
+import threading
+from concurrent.futures import ThreadPoolExecutor
 
 # Third-party packages
 import pandas as pd
-from jira import JIRA
+from jira import JIRA, JIRAError
+
+# Local imports
+from services.sync_service import load_sync_state, save_sync_state, delta_jql, upsert_issues, upsert_events
+from services.cache_service import save_tables, load_tables, dataset_meta, export_excel, to_storable
+from services.changelog_service import EVENT_COLUMNS, CATEGORICAL_COLUMNS, encode_events, to_wide, events_for
+from services.job_service import JobCancelled
+from services.dtype_service import compact_tables
+from services.flow_service import flow_deltas, combine_deltas, update_flow, load_flow, save_flow
+from services.field_service import load_field_metadata, prime_client_cache, resolve_fields, extract_fields
+from services.timestamp_service import configured_timezone, reported_timezone, parse_jira_timestamps, format_elapsed, hours_in_previous_status, same_timezone
+from projects import JIRA_SOURCES
+
+
+# Number of search pages requested at the same time, unless JIRA_FETCH_WORKERS says otherwise.
+# 1 keeps the old serial loop.
+MAX_WORKERS = 8
+# A request still answered 429 after the Jira client's own retries is retried this many
+# more times, all page threads pausing for RATE_LIMIT_BACKOFF seconds, doubled per retry
+RATE_LIMIT_RETRIES = 5
+RATE_LIMIT_BACKOFF = 1.0
+RECORDS_PER_PAGE = 100
+# Sources pulled at the same time (unless JIRA_SOURCE_WORKERS says otherwise), each with its own page pool
+SOURCE_WORKERS = 4
+
+JQL = 'project = UAT AND issuetype = Bug AND affectedversion = "Release 0.12"'
+CACHE_NAME = 'jira'
+# Several sources fetched together are merged into this dataset
+MERGED_NAME = 'jira-merged'
+# Issue column holding the label of the source an issue was pulled from
+SOURCE_COLUMN = 'Source'
+EXCEL_FILE = 'JIRA_Complete_Data.xlsx'
+
+ISSUE_COLUMNS = ["JIRA Key", "Display Name", "Created Date", "Details", "Priority", "Resolution", "Assignee", "Status", "Environment", "Root Cause", "Severity", "Total Elapsed Time", "Updated Date"]
+
+
+def fetch_workers() -> int:
+    """JIRA_FETCH_WORKERS (default MAX_WORKERS), read when a pull starts so a `.env` loaded after import applies."""
+    return int(os.getenv('JIRA_FETCH_WORKERS', MAX_WORKERS))
+
+def excel_export_enabled() -> bool:
+    """JIRA_EXPORT_EXCEL, read per pull: the app reads the Parquet cache, the Excel copy is only an export for people."""
+    return os.getenv('JIRA_EXPORT_EXCEL', '').lower() in ('1', 'true', 'yes')
+
+def get_from_jira(server: str="https://unisysbes.atlassian.net", save_local: bool=True, max_workers: int=None, incremental: bool=False, progress=None, cancel=None):
+    return pull_from_jira_api(server, save_local, max_workers, incremental, progress, cancel)
+
+def pull_from_jira_api(server: str="https://unisysbes.atlassian.net", save_local: bool=True, max_workers: int=None, incremental: bool=False, progress=None, cancel=None,
+                       jql: str=JQL, cache_name: str=CACHE_NAME, source: str=None, make_current: bool=True):
+    """
+    Pulls JIRA data from the specified server, processes, returns (issues, events) dataframes
 
+    `issues` has one row per issue. `events` has one row per status transition
+    (see `services.changelog_service.EVENT_COLUMNS`), joined on `JIRA Key`; the
+    old wide layout can be derived with `changelog_service.to_wide`.
 
-def get_from_jira(server: str="https://unisysbes.atlassian.net", save_local: bool=True) -> pd.DataFrame:
-    return pull_from_jira_api(server, save_local)
+    Search pages are requested on a pool of `max_workers` threads (default
+    `fetch_workers()`) and put back together in page order, so the result is
+    identical to the serial loop. When Jira keeps answering 429, every thread
+    backs off before the page is retried (RATE_LIMIT_RETRIES).
 
-def pull_from_jira_api(server: str="https://unisysbes.atlassian.net", save_local: bool=True) -> pd.DataFrame:
-    """
-    Pulls JIRA data from the specified server, processes, returns dataframe
+    When a cached copy exists, a full pull runs in two phases: issue headers
+    first, then changelogs (in batches of 100 keys) only for issues whose
+    `updated` moved; the other issues keep their cached events. Changelogs that
+    Jira truncates at 100 histories are paged through the changelog endpoint.
+
+    With `save_local` the result is written to the dataset cache (see
+    `services.cache_service`), plus `JIRA_Complete_Data.xlsx` if `excel_export_enabled()`.
+
+    With `incremental=True` (and a previous pull in the cache) only issues
+    updated since the last sync are requested and upserted by `JIRA Key` into
+    the cached dataset. Issues deleted in Jira are only dropped by a full pull.
+
+    `progress(pages_done, total_pages, issues_done)` is called after every page,
+    and setting the `cancel` threading.Event makes the pull raise JobCancelled
+    before its next page (see `services.job_service`).
+
+    `jql` selects the issues and `cache_name` the cache dataset they are kept
+    in; the sync state is kept per (server, jql). With `source`, every issue is
+    tagged with it in SOURCE_COLUMN (see `pull_sources`).
 
     NOTE: This is essentially a git-safe copy-paste from the Jupyter Notebook
         `Updated JIRA FAT DEFECTS.ipynb`
@@ -26,6 +97,17 @@ def pull_from_jira_api(server: str="https://unisysbes.atlassian.net", save_local
     """
 
     print('pull_from_jira_api called')
+    if max_workers is None:
+        max_workers = fetch_workers()
+
+    # High-water mark for the next delta pull: taken before any request is made
+    syncStartTS = time.time()
+    syncState = load_sync_state(server, jql) if incremental and save_local else None
+    if syncState is not None and dataset_meta(cache_name) is None:
+        syncState = None
+    sourceJql = jql
+    jql = sourceJql if syncState is None else delta_jql(sourceJql, syncState['last_sync'], syncStartTS)
+    print(f"{'Incremental' if syncState else 'Full'} pull: {jql}")
 
     jiraOptions = {'server': server}
 
@@ -36,145 +118,360 @@ def pull_from_jira_api(server: str="https://unisysbes.atlassian.net", save_local
             os.getenv('JIRA_API_KEY'))
         )
 
-    current_datetime = datetime.datetime.now()
-    currentTS = current_datetime.timestamp()
-
-    allfields = jira.fields()
-    nameMap = {jira.field['name']: jira.field['id'] for jira.field in allfields}
-
-    fieldnames = []
-    data = []
-
-    date_format = '%m/%d/%Y %I:%M %p'
-
-    hours = "hours"
-    minutes = "minutes"
-    seconds = "seconds"
-    days = "days"
-
-    createdDateTS = None
-
-    def format_elapsed_time(elapsed_seconds):
-        elapsed_days = floor(elapsed_seconds / (60 * 60 * 24))
-        elapsed_seconds -= elapsed_days * (60 * 60 * 24)
-        elapsed_hours = floor(elapsed_seconds / (60 * 60))
-        elapsed_seconds -= elapsed_hours * (60 * 60)
-        elapsed_minutes = floor(elapsed_seconds / 60)
-        elapsed_seconds -= elapsed_minutes * 60
-
-        elapsed_time_str = ""
-        if elapsed_days > 0:
-            elapsed_time_str += f"{elapsed_days} {days}, "
-        elapsed_time_str += f"{elapsed_hours} {hours}, {elapsed_minutes} {minutes}, {elapsed_seconds} {seconds}"
-        
-        return elapsed_time_str
+    currentTime = pd.Timestamp.now(tz='UTC')
+
+    # Only request the fields the dashboard uses (see field_service.FIELD_SPECS)
+    fieldMetadata = load_field_metadata(jira, server)
+    prime_client_cache(jira, fieldMetadata)
+    resolvedFields = resolve_fields(fieldMetadata)
+    searchFields = sorted({fieldId for fieldId, _ in resolvedFields.values()})
+
+    # Cached copy of this dataset: the base for a delta pull, and lets a full pull skip
+    # the changelogs of issues that have not been updated since (two-phase pull)
+    cached = load_tables(cache_name) if save_local and dataset_meta(cache_name) is not None else None
+    cachedVersion = dataset_meta(cache_name)['version'] if cached is not None else None
+    twoPhase = syncState is None and cached is not None
+
+    def runPool(fn, *iterables):
+        """fn over the iterables on up to `max_workers` threads; results in input order."""
+        n = len(iterables[0])
+        if max_workers > 1 and n > 1:
+            # map() yields in submission order, so pages stay in ORDER BY order
+            with ThreadPoolExecutor(max_workers=min(max_workers, n)) as executor:
+                return list(executor.map(fn, *iterables))
+        return [fn(*args) for args in zip(*iterables)]
+
+    def checkCancel():
+        if cancel is not None and cancel.is_set():
+            raise JobCancelled()
+
+    def rateLimited(call, *args, **kwargs):
+        """call(*args, **kwargs), retried with backoff while Jira answers 429; other threads wait out the backoff too."""
+        for attempt in range(RATE_LIMIT_RETRIES + 1):
+            pause = throttle['until'] - time.time()
+            if pause > 0:
+                time.sleep(pause)
+            try:
+                return call(*args, **kwargs)
+            except JIRAError as error:
+                if error.status_code != 429 or attempt == RATE_LIMIT_RETRIES:
+                    raise
+                delay = RATE_LIMIT_BACKOFF * 2 ** attempt * (1 + random.random())
+                with throttleLock:
+                    throttle['until'] = max(throttle['until'], time.time() + delay)
+                print(f"Rate limited by Jira; backing off {delay:.1f}s (retry {attempt + 1}/{RATE_LIMIT_RETRIES})")
+                checkCancel()
+
+    def reportProgress(pages, issues=0, extraPages=0):
+        if progress is not None:
+            with progressLock:
+                progressCount['total'] += extraPages
+                progressCount['pages'] += pages
+                progressCount['issues'] += issues
+                progress(progressCount['pages'], progressCount['total'], progressCount['issues'])
+
+    def searchPage(startAt, end, jqlStr, fields, expand):
+        """Issues startAt..end of jqlStr; re-requests the rest if the server caps maxResults lower."""
+        issues = []
+        while startAt + len(issues) < end:
+            # json_result skips building a Resource object per issue; we only read a few keys
+            batch = rateLimited(jira.search_issues, jql_str=jqlStr, startAt=startAt + len(issues), maxResults=end - startAt - len(issues),
+                                       fields=fields, expand=expand, json_result=True)['issues']
+            if not batch:
+                break
+            issues.extend(batch)
+        return issues
+
+    def statusEvents(key, historyRecords):
+        """Event tuples for the status changes in `historyRecords` (oldest first)."""
+        events = []
+        i = 0
+        for history in historyRecords:
+            for item in history['items']:
+                if item['field'] == 'status':
+                    events.append((key, i, item.get('fromString'), item.get('toString'),
+                                   (history.get('author') or {}).get('displayName'), history['created'], None))
+                    i += 1
+        return events
+
+    def changelogEvents(issue, events, truncated):
+        """Events from a search result's embedded changelog, unless Jira cut it short (>100 histories)."""
+        changelog = issue.get('changelog')
+        if changelog is None:
+            return
+        historyRecords = changelog.get('histories', [])
+        if changelog.get('total', len(historyRecords)) > len(historyRecords):
+            truncated.append(issue['key'])
+            return
+        # Search returns the newest history first
+        events.extend(statusEvents(issue['key'], historyRecords[::-1]))
 
     def fetchJiraTickets(startAt, pageNumber):
-        global createdDateTS  
-        for issue in jira.search_issues(jql_str='project = UAT AND issuetype = Bug AND affectedversion = "Release 0.12" ORDER BY created DESC', startAt=startAt, maxResults=100, expand='changelog'):
-            formattedCreatedDate = dateutil.parser.parse(issue.fields.created).strftime(date_format)
-
-            jiraItemDict = {"JIRA Key": issue.key, "Display Name": issue.fields.reporter.displayName, "Created Date": formattedCreatedDate}
-            fieldnames.extend(["JIRA Key", "Display Name", "Created Date", "Details", "Priority", "Resolution", "Assignee", "Status", "Environment", "Root Cause", "Severity"])
-            
-            try:
-                jiraItemDict["Details"] = issue.fields.summary
-                jiraItemDict["Priority"] = issue.fields.priority.name
-                jiraItemDict["Resolution"] = issue.fields.resolution
-                jiraItemDict["Assignee"] = issue.fields.assignee.displayName
-                jiraItemDict["Status"] = issue.fields.status.name
-                jiraItemDict["Environment"] = issue.fields.customfield_10065.value
-                jiraItemDict["Root Cause"] = issue.fields.customfield_10063.value
-                jiraItemDict["Severity"] = issue.fields.customfield_10072.value
-            except AttributeError:
-                pass
-
-            createdDate = dateutil.parser.parse(issue.fields.created)
-            createdDateTS = createdDate.timestamp()
-            elapsedTSSinceCreation = (currentTS - createdDateTS)
-
-            fieldnames.append("Total Elapsed Time")
-
-            jiraItemDict["Total Elapsed Time"] = format_elapsed_time(elapsedTSSinceCreation)
-
-            i = 0
-            data.append(jiraItemDict)
-            historyRecords = issue.changelog.histories
-            historyRecords.reverse()
-
-            previousHistoryCreatedDate = None
-            
-            if historyRecords is not None:
-                for history in historyRecords:
-                    for item in history.items:
-                        if item.field == 'status':
-                            historyCreatedDate = dateutil.parser.parse(history.created)
-                            
-                            if (previousHistoryCreatedDate is None):
-                                issueCreatedDate = dateutil.parser.parse(issue.fields.created)
-                                dateTimeDiff = (historyCreatedDate.timestamp() - issueCreatedDate.timestamp())
-                            else:
-                                dateTimeDiff = (historyCreatedDate.timestamp() - previousHistoryCreatedDate.timestamp())
-
-                            
-                            if i == 1:
-                                time_status_field = f"Time in Status {i}"
-                            else:
-                                time_status_field = f"Time In Status {i}"
-                            
-                            fieldnames.extend([time_status_field, f"Old Status {i}", f"New Status {i}", f"Changed By {i}", f"Changed Date {i}"])
-                            
-                            elapsedTimeInHours = dateTimeDiff / 3600  
-                            jiraItemDict[time_status_field] = elapsedTimeInHours  
-
-                            jiraItemDict[f"Old Status {i}"] = item.fromString
-                            jiraItemDict[f"New Status {i}"] = item.toString
-                            jiraItemDict[f"Changed By {i}"] = history.author.displayName
-                            jiraItemDict[f"Changed Date {i}"] = dateutil.parser.parse(history.created).strftime(date_format)
-
-                            i += 1
-                            previousHistoryCreatedDate = historyCreatedDate
-        return data
-
-
-    jiraCount = jira.search_issues(jql_str='project = UAT AND issuetype = Bug AND affectedversion = "Release 0.12" ORDER BY created DESC', startAt=0, maxResults=0, json_result=True)
+        # Timestamps are kept as the raw ISO strings here and parsed in bulk once all pages are in
+        checkCancel()
+        print(f"Processing Page # {pageNumber}")
+        pageStart = time.perf_counter()
+        data = []
+        events = []
+        truncated = []
+        end = min(startAt + RECORDS_PER_PAGE, totalJiraItems)
+        for issue in searchPage(startAt, end, f'{jql} ORDER BY created DESC', searchFields, None if twoPhase else 'changelog'):
+            data.append({"JIRA Key": issue['key'], **extract_fields(issue['fields'], resolvedFields)})
+            changelogEvents(issue, events, truncated)
+        reportProgress(1, len(data))
+        return data, events, truncated, time.perf_counter() - pageStart
+
+    def fetchChangelogBatch(keys):
+        """Phase 2: embedded changelogs of up to RECORDS_PER_PAGE issues, by key."""
+        checkCancel()
+        events = []
+        truncated = []
+        jqlStr = f"key in ({', '.join(keys)})"
+        for issue in searchPage(0, len(keys), jqlStr, ['updated'], 'changelog'):
+            changelogEvents(issue, events, truncated)
+        reportProgress(1)
+        return events, truncated
+
+    def fetchFullChangelog(key):
+        """Page through the changelog endpoint for an issue whose embedded changelog was truncated."""
+        checkCancel()
+        historyRecords = []
+        while True:
+            page = rateLimited(jira._get_json, f'issue/{key}/changelog', params={'startAt': len(historyRecords), 'maxResults': RECORDS_PER_PAGE})
+            historyRecords.extend(page['values'])
+            if page.get('isLast', True) or not page['values'] or len(historyRecords) >= page.get('total', 0):
+                break
+        reportProgress(1)
+        return statusEvents(key, historyRecords)
+
+
+    throttleLock = threading.Lock()
+    throttle = {'until': 0.0}
+    jiraCount = rateLimited(jira.search_issues, jql_str=f'{jql} ORDER BY created DESC', startAt=0, maxResults=0, json_result=True)
     totalJiraItems = jiraCount['total']
     print(f"Total Number of JIRA Items: {totalJiraItems}")
-    recordsPerPage = 100
-    totalPages = math.ceil(totalJiraItems/recordsPerPage)
+    totalPages = math.ceil(totalJiraItems/RECORDS_PER_PAGE)
+    startAts = [page * RECORDS_PER_PAGE for page in range(totalPages)]
+    pageNumbers = range(1, totalPages + 1)
 
-    startAt = 0
-    pageNumber = 1
+    progressLock = threading.Lock()
+    progressCount = {'pages': 0, 'issues': 0, 'total': totalPages}
+    reportProgress(0)
 
-    while pageNumber <= totalPages:
-        print(f"Processing Page # {pageNumber}")
-        data = fetchJiraTickets(startAt, pageNumber)
-        pageNumber += 1
-        startAt += 100
+    fetchStart = time.perf_counter()
+    pages = runPool(fetchJiraTickets, startAts, pageNumbers)
+    fetchElapsed = time.perf_counter() - fetchStart
 
+    data = []
+    events = []
+    truncated = []
+    for pageData, pageEvents, pageTruncated, _ in pages:
+        data.extend(pageData)
+        events.extend(pageEvents)
+        truncated.extend(pageTruncated)
+
+    report_fetch_speed(len(data), fetchElapsed, [pageElapsed for *_, pageElapsed in pages], max_workers)
+
+    new_data = pd.DataFrame(data, columns=ISSUE_COLUMNS)
+    # An issue created during the pull shifts the later offset pages, so one issue can come back
+    # on two pages; keep its first copy (its events are deduplicated below)
+    new_data = new_data.drop_duplicates('JIRA Key', keep='first', ignore_index=True)
+
+    # Vectorized timestamp handling: one parse per column instead of several per issue/history
+    # A delta or two-phase pull is parsed in the cached copy's timezone: Jira's reported offset moves
+    # with DST, and columns with different offsets would concatenate as objects instead of datetimes
+    cachedTz = cached[0]['Created Date'].dt.tz if cached is not None and isinstance(cached[0]['Created Date'].dtype, pd.DatetimeTZDtype) else None
+    tz = configured_timezone() or cachedTz or reported_timezone(new_data['Created Date'])
+    new_data['Created Date'] = parse_jira_timestamps(new_data['Created Date'], tz)
+    new_data['Total Elapsed Time'] = format_elapsed(currentTime - new_data['Created Date'])
+    new_data['Updated Date'] = parse_jira_timestamps(new_data['Updated Date'], tz)
+
+    changedKeys = new_data['JIRA Key']
+    if twoPhase:
+        # Phase 2: changelogs only for issues that are new or whose `updated` moved
+        cachedIssues, cachedEvents = cached
+        if 'Updated Date' in cachedIssues:
+            cachedUpdated = cachedIssues.drop_duplicates('JIRA Key').set_index('JIRA Key')['Updated Date']
+            changed = new_data['Updated Date'].ne(new_data['JIRA Key'].map(cachedUpdated))
+            changedKeys = new_data.loc[changed, 'JIRA Key']
+        keyBatches = [changedKeys.iloc[i:i + RECORDS_PER_PAGE].tolist() for i in range(0, len(changedKeys), RECORDS_PER_PAGE)]
+        print(f"Two-phase pull: {len(changedKeys)} of {len(new_data)} issues changed, {len(keyBatches)} changelog batches")
+        reportProgress(0, extraPages=len(keyBatches))
+        for batchEvents, batchTruncated in runPool(fetchChangelogBatch, keyBatches):
+            events.extend(batchEvents)
+            truncated.extend(batchTruncated)
+
+    if truncated:
+        # Phase 3: Jira embeds at most 100 histories; page through the rest
+        print(f"Paging the changelog of {len(truncated)} issues with more than {RECORDS_PER_PAGE} histories")
+        reportProgress(0, extraPages=len(truncated))
+        for issueEvents in runPool(fetchFullChangelog, truncated):
+            events.extend(issueEvents)
+
+    new_events = pd.DataFrame(events, columns=EVENT_COLUMNS).drop_duplicates(['JIRA Key', 'Seq'], keep='first')
+    # Issue order, then transition order, whatever phase the events came from
+    issueOrder = pd.Series(range(len(new_data)), index=new_data['JIRA Key'].values)
+    new_events = new_events.iloc[new_events['JIRA Key'].map(issueOrder).argsort(kind='stable').values]
+    new_events['Changed Date'] = parse_jira_timestamps(new_events['Changed Date'], tz)
+    created = new_data.set_index('JIRA Key')['Created Date']
+    new_events['Time In Status'] = hours_in_previous_status(new_events, created)
+
+    new_data = to_storable(new_data)
+    new_events = encode_events(new_events)
+
+    if syncState is not None:
+        existing_data, existing_events = cached
+        combined_data = upsert_issues(existing_data, new_data)
+        combined_data = combined_data.sort_values('Created Date', ascending=False, kind='stable', ignore_index=True)
+        combined_events = upsert_events(existing_events, new_events, new_data['JIRA Key'])
+        print(f"Upserted {len(new_data)} changed issues into {len(existing_data)} local issues")
+        # Issues whose transitions the cumulative flow has to replay
+        flowKeys = new_data['JIRA Key']
+    elif twoPhase:
+        # Unchanged issues keep their cached events; issues gone from the JQL lose theirs
+        combined_data = new_data
+        combined_events = upsert_events(events_for(new_data, cachedEvents), new_events, changedKeys)
+        removedKeys = cachedIssues.loc[~cachedIssues['JIRA Key'].isin(new_data['JIRA Key']), 'JIRA Key']
+        flowKeys = pd.concat([changedKeys, removedKeys.astype(object)], ignore_index=True)
+    else:
+        combined_data = new_data
+        combined_events = new_events
+        flowKeys = None
 
-    fieldnames = list(dict.fromkeys(fieldnames))
+    if source is not None:
+        combined_data[SOURCE_COLUMN] = source
 
-    # Check if a previous dataset exists and load it
-    if os.path.exists('JIRA_Complete_Data.xlsx'):
-        #existing_data = pd.read_excel('JIRA_Complete_Data.xlsx')
-        #new_data = pd.DataFrame(data, columns=fieldnames)
-        # Concatenate the existing data with the new data
-        #combined_data = pd.concat([existing_data, new_data]).drop_duplicates(subset="JIRA Key", keep="last")
-        combined_data = pd.DataFrame(data, columns=fieldnames)
-    else:
-        combined_data = pd.DataFrame(data, columns=fieldnames)
+    # Categoricals with shared person/status dictionaries, float32 hours
+    combined_data, combined_events = compact_tables(combined_data, combined_events)
 
     print("Data processing complete.") 
 
     if save_local:
-        #timestamp = datetime.now().strftime("%Y%m%d%H%M%S")
-        combined_data.to_excel(f'JIRA_Complete_Data.xlsx', index=False)
-        print("The file 'JIRA_Complete_Data.xlsx' has been updated.")
+        entry = save_tables(combined_data, combined_events, cache_name, make_current=make_current)
+        # Daily status counts: replay only the synced issues on top of the cached table
+        previousFlow = load_flow(cache_name, cachedVersion) if flowKeys is not None else None
+        if previousFlow is not None:
+            flow = update_flow(previousFlow, *cached, combined_data, combined_events, flowKeys)
+            print(f"Replayed the transitions of {len(flowKeys)} issues into the cumulative flow")
+        else:
+            flow = flow_deltas(combined_data, combined_events)
+        save_flow(flow, cache_name, entry['version'])
+        save_sync_state(server, sourceJql, syncStartTS, len(combined_data))
+        if excel_export_enabled():
+            export_excel(to_wide(combined_data, combined_events), EXCEL_FILE)
+
+    return combined_data, combined_events
+
+def pull_sources(labels, save_local: bool=True, max_workers: int=None, incremental: bool=False, progress=None, cancel=None, sources: dict=JIRA_SOURCES):
+    """
+    Pulls several Jira sources (labels of `sources`, see `projects.JIRA_SOURCES`) concurrently and merges them.
+
+    Every source is a separate `pull_from_jira_api` on its own thread (up to
+    JIRA_SOURCE_WORKERS at once), with its own page pool, cache dataset and sync
+    state, so adding a source does not slow down the others' incremental syncs;
+    the merge only concatenates their tables. A source whose pull fails is
+    merged from its cached copy, if it has one.
+
+    A single source is cached and returned as is. Several are merged into
+    MERGED_NAME, issues tagged with their source's label in SOURCE_COLUMN; an
+    issue found by more than one source is kept (with its events) from the
+    first. `progress` gets the sums over all sources.
+    """
+    labels = list(dict.fromkeys(labels))
+    if len(labels) == 1:
+        source = sources[labels[0]]
+        return pull_from_jira_api(source['server'], save_local, max_workers, incremental, progress, cancel,
+                                  jql=source['jql'], cache_name=source['cache'], source=labels[0])
+
+    progressLock = threading.Lock()
+    sourceProgress = {label: (0, 0, 0) for label in labels}
+
+    def reportProgress(label):
+        def report(done, total, items):
+            with progressLock:
+                sourceProgress[label] = (done, total or 0, items)
+                if progress is not None:
+                    progress(*map(sum, zip(*sourceProgress.values())))
+        return report
+
+    def pullSource(label):
+        source = sources[label]
+        try:
+            return pull_from_jira_api(source['server'], save_local, max_workers, incremental, reportProgress(label), cancel,
+                                      jql=source['jql'], cache_name=source['cache'], source=label, make_current=False)
+        except JobCancelled:
+            raise
+        except Exception as error:
+            cached = load_tables(source['cache']) if save_local else None
+            if cached is None:
+                raise
+            print(f"Pulling '{label}' failed ({error!r}); merging its cached copy")
+            issues, events = cached
+            return issues.assign(**{SOURCE_COLUMN: label}), events
+
+    pullStart = time.perf_counter()
+    sourceWorkers = int(os.getenv('JIRA_SOURCE_WORKERS', SOURCE_WORKERS))
+    with ThreadPoolExecutor(max_workers=min(sourceWorkers, len(labels))) as executor:
+        tables = list(executor.map(pullSource, labels))
+    print(f"Pulled {len(labels)} sources in {time.perf_counter() - pullStart:.2f}s")
+
+    issues, events, overlap = merge_sources(tables)
+    if save_local:
+        entry = save_tables(issues, events, MERGED_NAME)
+        # Without overlapping issues the merged flow is the sum of the sources' flows
+        flows = [] if overlap else [load_flow(sources[label]['cache'], dataset_meta(sources[label]['cache'])['version'])
+                                    for label in labels]
+        if flows and all(flow is not None for flow in flows):
+            flow = combine_deltas(flows)
+        else:
+            flow = flow_deltas(issues, events)
+        save_flow(flow, MERGED_NAME, entry['version'])
+    return issues, events
+
+def merge_sources(tables):
+    """
+    One (issues, events) pair from several sources' pairs, and whether any issue was in more than one.
 
-    return combined_data
+    Issues keep the first source's row (and events) for a key found more than
+    once, and are sorted newest first; category dictionaries are rebuilt over
+    the union (see `dtype_service.compact_tables`).
+    """
+    seen = pd.Index([])
+    issueParts = []
+    eventParts = []
+    for issues, events in tables:
+        keys = issues['JIRA Key'].astype(object)
+        duplicate = keys.isin(seen)
+        issueParts.append(issues[~duplicate].astype({col: object for col in issues.select_dtypes('category').columns}))
+        eventParts.append(events[~events['JIRA Key'].astype(object).isin(seen)])
+        seen = seen.append(pd.Index(keys[~duplicate]))
+    overlap = sum(map(len, issueParts)) < sum(len(issues) for issues, _ in tables)
+
+    issues = pd.concat(same_timezone(issueParts), ignore_index=True)
+    issues = issues.sort_values('Created Date', ascending=False, kind='stable', ignore_index=True)
+    as_strings = {col: object for col in CATEGORICAL_COLUMNS}
+    events = encode_events(pd.concat([part.astype(as_strings) for part in same_timezone(eventParts)], ignore_index=True))
+    issues, events = compact_tables(issues, events)
+    print(f"Merged {len(tables)} sources: {len(issues)} issues, {len(events)} events")
+    return issues, events, overlap
+
+def report_fetch_speed(n_issues, elapsed, page_times, max_workers):
+    """
+    Print fetch throughput: issues and pages per second, and the mean page latency.
 
-def process_jira_data(df):
+    Page latencies overlap (and include rate-limit backoff) when pages are fetched at
+    once, so their sum is no serial baseline; compare real runs with different worker
+    counts instead (`python -m services.fake_jira_server --bench 1,8`).
+    """
+    rate = n_issues / elapsed if elapsed else 0.0
+    page_rate = len(page_times) / elapsed if elapsed else 0.0
+    latency = sum(page_times) / len(page_times) if page_times else 0.0
+    print(f"Fetched {n_issues} issues in {len(page_times)} pages in {elapsed:.2f}s ({rate:.1f} issues/s, "
+          f"{page_rate:.1f} pages/s) with {max_workers} worker(s); mean page latency {latency:.2f}s")
+    return {'issues': n_issues, 'pages': len(page_times), 'elapsed': elapsed, 'issues_per_second': rate,
+            'pages_per_second': page_rate, 'mean_page_latency': latency, 'workers': max_workers}
+
+def process_jira_data(df, events):
     # Process the Jira data for your dashboard needs, e.g., create contributor columns
     df['Created Date'] = pd.to_datetime(df['Created Date'])
     min_date = df['Created Date'].min().date()
@@ -183,9 +480,8 @@ def process_jira_data(df):
     assignee_counts = df['Assignee'].value_counts().reset_index()
     assignee_counts.columns = ['Person', 'Assignee Count']
 
-    contributor_columns = [f'Changed By {i}' for i in range(76)]
-    contributor_df = pd.melt(df, id_vars=['JIRA Key'], value_vars=contributor_columns, value_name='Contributor')
-    contributor_df = contributor_df.drop_duplicates(subset=['JIRA Key', 'Contributor'])
+    contributor_df = events[['JIRA Key', 'Changed By']].astype(object).drop_duplicates()
+    contributor_df = contributor_df.rename(columns={'Changed By': 'Contributor'})
     contributor_df = contributor_df.merge(df[['JIRA Key', 'Assignee']], on='JIRA Key', how='left')
     contributor_df = contributor_df[contributor_df['Contributor'] != contributor_df['Assignee']]
 
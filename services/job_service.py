@@ -0,0 +1,118 @@
+import time
+import queue
+import uuid
+import threading
+
+# Jobs run one after another on a single background thread: two fetches at once
+# would only compete for the same Jira rate limit and the same cache files
+JOB_WORKERS = 1
+# Finished jobs kept around for their results / status
+KEEP_FINISHED = 20
+
+
+class JobCancelled(Exception):
+    """Raised inside a job function that noticed its cancel event was set."""
+
+
+class Job:
+    def __init__(self, name, fn, args, kwargs):
+        self.id = uuid.uuid4().hex
+        self.name = name
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.status = 'queued'  # queued -> running -> done | failed | cancelled
+        self.result = None
+        self.error = None
+        self.cancel_event = threading.Event()
+        self.created = time.time()
+        self.started = None
+        self.finished = None
+        self._lock = threading.Lock()
+        self._progress = {'done': 0, 'total': None, 'items': 0, 'started': None}
+
+    def update_progress(self, done, total, items):
+        """Progress callback handed to the job function; safe to call from any thread."""
+        with self._lock:
+            if self._progress['started'] is None:
+                self._progress['started'] = time.time()
+            self._progress.update(done=done, total=total, items=items)
+
+    def cancel(self):
+        self.cancel_event.set()
+
+    def progress(self):
+        """Snapshot: pages done/total, items, items per second and estimated seconds remaining."""
+        with self._lock:
+            progress = dict(self._progress)
+        elapsed = time.time() - progress['started'] if progress['started'] else 0.0
+        progress['rate'] = progress['items'] / elapsed if elapsed else 0.0
+        if progress['total'] and progress['done']:
+            progress['eta'] = elapsed / progress['done'] * (progress['total'] - progress['done'])
+        else:
+            progress['eta'] = None
+        progress['status'] = self.status
+        return progress
+
+    def run(self):
+        if self.cancel_event.is_set():
+            self.status = 'cancelled'
+            self.finished = time.time()
+            return
+        self.status = 'running'
+        self.started = time.time()
+        try:
+            self.result = self.fn(*self.args, progress=self.update_progress, cancel=self.cancel_event, **self.kwargs)
+            self.status = 'done'
+        except JobCancelled:
+            self.status = 'cancelled'
+        except Exception as err:
+            self.error = f'{type(err).__name__}: {err}'
+            self.status = 'failed'
+        self.finished = time.time()
+        print(f"Job '{self.name}' {self.status} after {self.finished - self.started:.1f}s")
+
+
+_queue = queue.Queue()
+_jobs = {}
+_jobs_lock = threading.Lock()
+_workers = []
+
+
+def _work():
+    while True:
+        job = _queue.get()
+        try:
+            job.run()
+        finally:
+            _queue.task_done()
+
+
+def _prune():
+    finished = sorted((job for job in _jobs.values() if job.finished), key=lambda job: job.finished)
+    for job in finished[:-KEEP_FINISHED]:
+        del _jobs[job.id]
+
+
+def submit_job(name, fn, *args, **kwargs) -> Job:
+    """
+    Queue `fn(*args, progress=..., cancel=..., **kwargs)` on the background worker.
+
+    `progress(done, total, items)` reports progress; `fn` should raise JobCancelled
+    once the `cancel` threading.Event is set.
+    """
+    job = Job(name, fn, args, kwargs)
+    with _jobs_lock:
+        _prune()
+        _jobs[job.id] = job
+        while len(_workers) < JOB_WORKERS:
+            worker = threading.Thread(target=_work, name=f'job-worker-{len(_workers)}', daemon=True)
+            worker.start()
+            _workers.append(worker)
+    _queue.put(job)
+    return job
+
+
+def get_job(job_id):
+    with _jobs_lock:
+        return _jobs.get(job_id)
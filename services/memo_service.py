@@ -0,0 +1,61 @@
+import os
+import time
+import threading
+from collections import OrderedDict
+
+# Plot aggregates kept (least recently used evicted first); they are small frames
+AGGREGATE_CACHE_SIZE = int(os.getenv('AGGREGATE_CACHE_SIZE', 128))
+
+
+class AggregateCache:
+    """LRU memo of chart aggregates with hit/miss counters."""
+
+    def __init__(self, max_entries):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_compute(self, key, compute):
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+            self.misses += 1
+        # Computed outside the lock; two callbacks racing on the same key just both compute it
+        start = time.perf_counter()
+        value = compute()
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        print(f"Computed aggregate '{key[0]}' in {time.perf_counter() - start:.3f}s "
+              f"(hits {self.hits}, misses {self.misses})")
+        return value
+
+    def stats(self):
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses, 'entries': len(self._entries),
+                    'max_entries': self.max_entries}
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+aggregates = AggregateCache(AGGREGATE_CACHE_SIZE)
+
+
+def memoized(name, data_key, compute):
+    """
+    `compute()`, memoized under (name, data_key).
+
+    `data_key` identifies the data the aggregate is computed from (dataset hash
+    plus normalized filter state); None disables memoization.
+    """
+    if data_key is None:
+        return compute()
+    return aggregates.get_or_compute((name, data_key), compute)
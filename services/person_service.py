@@ -0,0 +1,75 @@
+import numpy as np
+import pandas as pd
+
+# Issue columns naming a person; 'Display Name' is the reporter. Changelog authors are added from the events.
+PERSON_COLUMNS = ['Assignee', 'Display Name']
+
+
+class PersonIndex:
+    """
+    Inverted person -> issue index over an (issues, events) pair.
+
+    Every person (assignee, reporter or author of a status change) gets an
+    interned id; `rows[offsets[i]:offsets[i + 1]]` are the sorted, distinct
+    positions in `issues` of the issues person `names[i]` touched.
+    """
+
+    def __init__(self, issues: pd.DataFrame, events: pd.DataFrame):
+        self.n_rows = len(issues)
+        positions = np.arange(self.n_rows, dtype=np.int64)
+        person_columns = [issues[col] for col in PERSON_COLUMNS if col in issues]
+        names = set()
+        for series in [*person_columns, events['Changed By']]:
+            names.update(_distinct(series))
+        self.names = sorted(str(name) for name in names)
+        name_index = pd.Index(self.names)
+
+        code_parts = [_codes(series, name_index) for series in person_columns]
+        row_parts = [positions] * len(person_columns)
+        if len(events):
+            first = ~issues['JIRA Key'].duplicated().to_numpy()
+            key_rows = np.append(positions[first], -1)
+            code_parts.append(_codes(events['Changed By'], name_index))
+            row_parts.append(key_rows[_codes(events['JIRA Key'], pd.Index(issues['JIRA Key'][first]))])
+        codes = np.concatenate(code_parts) if code_parts else np.array([], dtype=np.int64)
+        rows = np.concatenate(row_parts) if row_parts else np.array([], dtype=np.int64)
+        present = (codes >= 0) & (rows >= 0)
+        codes, rows = codes[present], rows[present]
+
+        # Sort by (person, row) and drop repeats: one entry per person and issue
+        pairs = codes.astype(np.int64) * max(self.n_rows, 1) + rows
+        pairs.sort()
+        pairs = pairs[np.append(True, pairs[1:] != pairs[:-1])] if len(pairs) else pairs
+        codes, self.rows = np.divmod(pairs, max(self.n_rows, 1))
+
+        self.ids = {name: i for i, name in enumerate(self.names)}
+        self.offsets = np.searchsorted(codes, np.arange(len(self.names) + 1))
+        self.nbytes = self.rows.nbytes + self.offsets.nbytes
+
+    def rows_for(self, persons) -> np.ndarray:
+        """Sorted positions of the issues touched by any of `persons` (unknown names are ignored)."""
+        return np.flatnonzero(self.mask(persons))
+
+    def mask(self, persons) -> np.ndarray:
+        """Boolean mask over the indexed issues: the union of the persons' issue rows."""
+        mask = np.zeros(self.n_rows, dtype=bool)
+        for person in persons:
+            i = self.ids.get(person)
+            if i is not None:
+                mask[self.rows[self.offsets[i]:self.offsets[i + 1]]] = True
+        return mask
+
+
+def _distinct(series: pd.Series):
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        used = np.bincount(series.cat.codes.to_numpy() + 1, minlength=len(series.cat.categories) + 1)[1:] > 0
+        return series.cat.categories[used]
+    return series.dropna().unique()
+
+
+def _codes(series: pd.Series, index: pd.Index) -> np.ndarray:
+    """Position of every value of `series` in `index` (-1 if missing); categoricals via their codes."""
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        lookup = np.append(index.get_indexer(series.cat.categories.astype(str)), -1)
+        return lookup[series.cat.codes.to_numpy()]
+    return index.get_indexer(series.astype(str).where(series.notna()))
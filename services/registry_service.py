@@ -0,0 +1,134 @@
+import os
+import json
+import hashlib
+import threading
+from collections import OrderedDict
+
+from services.cache_service import content_hash, dataset_meta, load_dataset, EVENTS_SUFFIX
+from services.changelog_service import encode_events
+
+# Memory the registry may hold before evicting the least recently used frames
+REGISTRY_BUDGET_MB = float(os.getenv('DATASET_REGISTRY_MB', 512))
+
+
+def frame_nbytes(*frames) -> int:
+    return int(sum(df.memory_usage(deep=True).sum() for df in frames))
+
+
+class DatasetRegistry:
+    """
+    In-process LRU of (issues, events) pairs, bounded by memory instead of entry count.
+
+    The most recently used entry is never evicted, even if it alone exceeds the budget.
+    """
+
+    def __init__(self, budget_bytes):
+        self.budget_bytes = budget_bytes
+        self.nbytes = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def put(self, key, value, nbytes=None):
+        """Add `value`: a tuple of frames, or anything else with its size given as `nbytes`."""
+        size = frame_nbytes(*value) if nbytes is None else nbytes
+        with self._lock:
+            if key in self._entries:
+                self.nbytes -= self._entries.pop(key)[1]
+            self._entries[key] = (value, size)
+            self.nbytes += size
+            while self.nbytes > self.budget_bytes and len(self._entries) > 1:
+                evicted, (_, evicted_size) = self._entries.popitem(last=False)
+                self.nbytes -= evicted_size
+                print(f"Evicted {evicted} ({evicted_size / 1e6:.1f} MB) from the dataset registry")
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            self._entries.move_to_end(key)
+            return entry[0]
+
+
+_registry = DatasetRegistry(REGISTRY_BUDGET_MB * 1e6)
+# Dataset id -> (cache name, issues version, events version): a few bytes each, never evicted
+_sources = {}
+
+
+def register_dataset(issues, events, source: str=None) -> str:
+    """
+    Keep an (issues, events) pair in the registry and return its dataset id.
+
+    `source` names the cache dataset the pair was loaded from or saved to; its
+    current version is recorded so an evicted pair can be read back from disk.
+    """
+    dataset_id = hashlib.sha1((content_hash(issues) + content_hash(events)).encode()).hexdigest()[:16]
+    if source is not None:
+        issues_meta = dataset_meta(source)
+        events_meta = dataset_meta(source + EVENTS_SUFFIX)
+        if issues_meta is not None and events_meta is not None:
+            _sources[dataset_id] = (source, issues_meta['version'], events_meta['version'])
+    _registry.put(dataset_id, (issues, events))
+    return dataset_id
+
+
+def get_dataset(dataset_id):
+    """(issues, events) of a registered dataset, reloaded from the cache after eviction; None if gone."""
+    frames = _registry.get(dataset_id)
+    if frames is not None or dataset_id not in _sources:
+        return frames
+    name, issues_version, events_version = _sources[dataset_id]
+    issues = load_dataset(name, version=issues_version)
+    events = load_dataset(name + EVENTS_SUFFIX, version=events_version)
+    if issues is None or events is None:
+        return None
+    frames = (issues, encode_events(events))
+    _registry.put(dataset_id, frames)
+    return frames
+
+
+def dataset_source(dataset_id):
+    """(cache name, issues version, events version) a registered dataset was loaded from or saved to, or None."""
+    return _sources.get(dataset_id)
+
+
+def get_derived(dataset_id, name, build):
+    """
+    Structure `build(issues, events)` derived from a registered dataset (e.g. an index).
+
+    Built once per dataset and registered under (dataset id, name); `build`'s
+    result must have an `nbytes` attribute for the memory budget.
+    """
+    key = (dataset_id, name)
+    derived = _registry.get(key)
+    if derived is None:
+        dataset = get_dataset(dataset_id)
+        if dataset is None:
+            return None
+        derived = build(*dataset)
+        _registry.put(key, derived, derived.nbytes)
+    return derived
+
+
+def filter_state_hash(filter_values) -> str:
+    """Short stable hash of the sidebar's filter selections (order within a filter ignored)."""
+    state = [sorted(map(str, values)) if values else [] for values in filter_values]
+    return hashlib.sha1(json.dumps(state).encode()).hexdigest()[:16]
+
+
+def get_filtered(dataset_id, filter_values, apply):
+    """
+    (issues, events) of `dataset_id` filtered by `filter_values`.
+
+    Filtered frames are registered under (dataset id, filter state hash);
+    on a miss they are rebuilt with `apply(issues, events, filter_values)`.
+    """
+    key = (dataset_id, filter_state_hash(filter_values))
+    frames = _registry.get(key)
+    if frames is None:
+        dataset = get_dataset(dataset_id)
+        if dataset is None:
+            return None
+        frames = apply(*dataset, filter_values)
+        _registry.put(key, frames)
+    return frames
@@ -0,0 +1,144 @@
+import numpy as np
+import pandas as pd
+
+from services.person_service import _codes, _distinct
+
+NS_PER_HOUR = 3600 * 10**9
+# Percentiles reported by default, in percent
+PERCENTILES = (50, 85, 95)
+
+
+def _ns(series: pd.Series) -> np.ndarray:
+    """Nanoseconds since the epoch (UTC) of a datetime series; NaT as the int64 minimum."""
+    return pd.DatetimeIndex(pd.to_datetime(series, utc=True)).as_unit('ns').asi8
+
+
+class StatusTimes:
+    """
+    Every stay of every issue in a status, computed in one vectorized pass.
+
+    An issue is in `Old Status` from the previous transition (or its creation)
+    until each transition, and in the `New Status` of its last transition (its
+    `Status` if it has none) from then until `now`. Interval i is issue row
+    `rows[i]` staying `hours[i]` in `statuses[status[i]]`, from `start[i]` to
+    `end[i]` (ns since the epoch, UTC); `current[i]` marks the still-running stays.
+    """
+
+    def __init__(self, issues: pd.DataFrame, events: pd.DataFrame, now=None):
+        self.n_rows = len(issues)
+        self.now = pd.Timestamp.now(tz='UTC') if now is None else pd.Timestamp(now)
+        positions = np.arange(self.n_rows, dtype=np.int64)
+        first = ~issues['JIRA Key'].duplicated().to_numpy()
+        key_rows = np.append(positions[first], -1)
+        created = _ns(issues['Created Date'])
+        now_ns = _ns(pd.Series([self.now]))[0]
+
+        names = set(_distinct(issues['Status']))
+        for col in ['Old Status', 'New Status']:
+            names.update(_distinct(events[col]))
+        self.statuses = sorted(str(name) for name in names)
+        status_index = pd.Index(self.statuses)
+
+        rows = key_rows[_codes(events['JIRA Key'], pd.Index(issues['JIRA Key'][first]))]
+        changed = _ns(events['Changed Date'])
+        old_status = _codes(events['Old Status'], status_index)
+        new_status = _codes(events['New Status'], status_index)
+        keep = (rows >= 0) & (changed != np.iinfo(np.int64).min)
+        rows, changed, old_status, new_status = rows[keep], changed[keep], old_status[keep], new_status[keep]
+        # Events come in transition order within each issue; group each issue's events together
+        if len(rows) and (np.diff(rows) < 0).any():
+            order = np.argsort(rows, kind='stable')
+            rows, changed, old_status, new_status = rows[order], changed[order], old_status[order], new_status[order]
+
+        starts_issue = np.ones(len(rows), dtype=bool)
+        starts_issue[1:] = rows[1:] != rows[:-1]
+        ends_issue = np.ones(len(rows), dtype=bool)
+        ends_issue[:-1] = starts_issue[1:]
+        previous = np.empty_like(changed)
+        previous[1:] = changed[:-1]
+        previous[starts_issue] = created[rows[starts_issue]]
+
+        # Current stays: after the last transition, or since creation for issues without any
+        without_events = np.ones(self.n_rows, dtype=bool)
+        without_events[rows] = False
+        quiet = positions[without_events]
+        current_rows = np.concatenate([rows[ends_issue], quiet])
+        current_status = np.concatenate([new_status[ends_issue], _codes(issues['Status'], status_index)[quiet]])
+        current_start = np.concatenate([changed[ends_issue], created[quiet]])
+
+        self.rows = np.concatenate([rows, current_rows]).astype(np.int32)
+        self.status = np.concatenate([old_status, current_status]).astype(np.int32)
+        self.start = np.concatenate([previous, current_start])
+        self.end = np.concatenate([changed, np.full(len(current_rows), now_ns)])
+        self.hours = (self.end - self.start) / NS_PER_HOUR
+        self.current = np.zeros(len(self.rows), dtype=bool)
+        self.current[len(rows):] = True
+        # Missing statuses or creation dates give no usable stay
+        valid = (self.status >= 0) & np.isfinite(self.hours) & (self.hours >= 0)
+        valid &= self.start != np.iinfo(np.int64).min
+        self.rows, self.status, self.hours, self.current = self.rows[valid], self.status[valid], self.hours[valid], self.current[valid]
+        self.start, self.end = self.start[valid], self.end[valid]
+        # Stays by increasing hours: every grouping then only needs a stable sort by group
+        self.by_hours = np.argsort(self.hours).astype(np.int32)
+        self.nbytes = (self.rows.nbytes + self.status.nbytes + self.hours.nbytes + self.current.nbytes
+                       + self.start.nbytes + self.end.nbytes + self.by_hours.nbytes)
+
+    def _group_codes(self, issues: pd.DataFrame, column):
+        """(code per stay, group names) for grouping by 'Status' or by an issue column."""
+        if column == 'Status':
+            return self.status.astype(np.int64), self.statuses
+        series = issues[column]
+        names = sorted(str(name) for name in _distinct(series))
+        return _codes(series, pd.Index(names))[self.rows].astype(np.int64), names
+
+    def percentiles(self, issues: pd.DataFrame, by='Status', percentiles=PERCENTILES, include_resolved=False,
+                    row_mask=None) -> pd.DataFrame:
+        """
+        Hours per stay, grouped by `by` ('Status' and/or columns of `issues`, the
+        frame the stays were computed from): count, mean and `percentiles`.
+
+        Only the stays of the issue rows selected by `row_mask` (default: all)
+        count. The running stay of an issue with a Resolution (e.g. sitting in
+        Done) is left out unless `include_resolved`.
+        """
+        by = [by] if isinstance(by, str) else list(by)
+        keep = np.ones(len(self.rows), dtype=bool) if row_mask is None else np.asarray(row_mask)[self.rows]
+        if not include_resolved and 'Resolution' in issues:
+            resolved = issues['Resolution'].notna().to_numpy()
+            keep &= ~(self.current & resolved[self.rows])
+
+        # One int64 code per combination of the grouping columns
+        group = np.zeros(len(self.rows), dtype=np.int64)
+        levels = []
+        for column in by:
+            codes, names = self._group_codes(issues, column)
+            keep &= codes >= 0
+            group = group * len(names) + codes
+            levels.append(names)
+        # Sort by (group, hours): each group's hours end up contiguous and ascending.
+        # Stable sorts of small unsigned ints are radix sorts.
+        order = self.by_hours[keep[self.by_hours]]
+        group = group[order]
+        group = group.astype(np.min_scalar_type(group.max())) if len(group) else group
+        by_group = np.argsort(group, kind='stable')
+        group, hours = group[by_group], self.hours[order[by_group]]
+        starts = np.flatnonzero(np.append(True, group[1:] != group[:-1])) if len(group) else np.array([], dtype=np.int64)
+        counts = np.diff(np.append(starts, len(group)))
+        present = group[starts].astype(np.int64)
+
+        result = {}
+        for column, names in zip(reversed(by), reversed(levels)):
+            present_codes = present % len(names) if len(names) else present
+            result[column] = np.asarray(names, dtype=object)[present_codes] if len(present) else np.array([], dtype=object)
+            present = present // max(len(names), 1)
+        result = {column: result[column] for column in by}
+        result['Count'] = counts
+        result['Mean Hours'] = np.add.reduceat(hours, starts) / counts if len(starts) else np.array([])
+        for p in percentiles:
+            # Linear interpolation between the closest ranks, as numpy.percentile
+            position = (counts - 1) * (p / 100)
+            low = np.floor(position).astype(np.int64)
+            high = np.minimum(low + 1, counts - 1)
+            fraction = position - low
+            result[f'P{p} Hours'] = hours[starts + low] * (1 - fraction) + hours[starts + high] * fraction
+        return pd.DataFrame(result)
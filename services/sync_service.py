@@ -0,0 +1,86 @@
+import os
+import json
+import math
+import time
+import threading
+from pathlib import Path
+
+import pandas as pd
+
+from services.changelog_service import CATEGORICAL_COLUMNS, encode_events
+from services.timestamp_service import same_timezone
+
+STATE_FILE = Path('JIRA_Sync_State.json')
+
+# Extra minutes re-requested on every delta pull, so edits made while the
+# previous pull was running (or small clock skew) are never missed
+SYNC_OVERLAP_MINUTES = 5
+
+# Sources pulled at the same time all record their state in STATE_FILE
+_state_lock = threading.Lock()
+
+
+def _state_key(server, jql):
+    return f'{server}|{jql}'
+
+
+def load_sync_state(server, jql, state_file=STATE_FILE):
+    """Return the stored sync state for this server/JQL pair, or None."""
+    state_file = Path(state_file)
+    with _state_lock:
+        if not state_file.exists():
+            return None
+        with open(state_file) as f:
+            return json.load(f).get(_state_key(server, jql))
+
+
+def save_sync_state(server, jql, last_sync, n_issues, state_file=STATE_FILE):
+    """Record `last_sync` (epoch seconds, taken before the pull started) as the high-water mark."""
+    state_file = Path(state_file)
+    with _state_lock:
+        states = {}
+        if state_file.exists():
+            with open(state_file) as f:
+                states = json.load(f)
+        states[_state_key(server, jql)] = {'last_sync': last_sync, 'issues': n_issues}
+        # Replaced in one step, so a reader (or a crash) never sees a half-written file
+        tmp = state_file.with_suffix('.tmp')
+        with open(tmp, 'w') as f:
+            json.dump(states, f, indent=4)
+        os.replace(tmp, state_file)
+
+
+def delta_jql(jql, last_sync, now=None):
+    """
+    Restrict `jql` to issues updated since `last_sync`.
+
+    Uses a relative date (`-Nm`) so the comparison happens in the Jira server's
+    own clock and timezone rather than ours.
+    """
+    now = time.time() if now is None else now
+    minutes = math.ceil((now - last_sync) / 60) + SYNC_OVERLAP_MINUTES
+    return f'({jql}) AND updated >= -{minutes}m'
+
+
+def upsert_issues(existing, new, key='JIRA Key'):
+    """Replace rows of `existing` whose `key` appears in `new`, and append the rest of `new`."""
+    if new.empty:
+        return existing
+    kept = existing[~existing[key].isin(new[key])]
+    columns = list(dict.fromkeys([*existing.columns, *new.columns]))
+    # Dates in the existing rows' timezone, or the concatenation would fall back to objects
+    kept, new = same_timezone([kept, new])
+    return pd.concat([new, kept], ignore_index=True).reindex(columns=columns)
+
+
+def upsert_events(existing, new, new_keys, key='JIRA Key'):
+    """Replace the events of every issue in `new_keys` by the freshly pulled `new` events."""
+    kept = existing[~existing[key].isin(new_keys)]
+    # Categories differ between the two frames; concatenate as plain strings and re-encode.
+    # Dates in the kept events' timezone: mixed offsets would concatenate as objects and come back NaT.
+    kept, new = same_timezone([kept, new])
+    as_strings = {col: object for col in CATEGORICAL_COLUMNS}
+    events = encode_events(pd.concat([new.astype(as_strings), kept.astype(as_strings)], ignore_index=True))
+    if events['Changed Date'].isna().sum() > kept['Changed Date'].isna().sum() + new['Changed Date'].isna().sum():
+        raise ValueError("Upserting events lost Changed Date values")
+    return events
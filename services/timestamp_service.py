@@ -0,0 +1,67 @@
+import os
+import datetime
+
+import pandas as pd
+
+# Jira's REST timestamps, e.g. '2024-09-06T19:00:00.000-1000'
+JIRA_TIME_FORMAT = '%Y-%m-%dT%H:%M:%S.%f%z'
+
+
+def configured_timezone():
+    """JIRA_TIMEZONE, the timezone parsed columns are shown in; read per call so a `.env` loaded after import applies."""
+    return os.getenv('JIRA_TIMEZONE') or None
+
+
+def reported_timezone(raw: pd.Series):
+    """Most common UTC offset in raw Jira timestamps, as a fixed-offset tzinfo."""
+    offsets = raw.dropna().str[-5:]
+    if offsets.empty:
+        return datetime.timezone.utc
+    offset = offsets.mode().iloc[0]
+    sign = -1 if offset[0] == '-' else 1
+    return datetime.timezone(sign * datetime.timedelta(hours=int(offset[1:3]), minutes=int(offset[3:5])))
+
+
+def parse_jira_timestamps(raw, tz=None) -> pd.Series:
+    """
+    Parse raw Jira timestamps in one vectorized pass into a datetime64[ns, tz] series.
+
+    Without `tz`: JIRA_TIMEZONE, or else the offset Jira reports the timestamps in.
+    """
+    raw = pd.Series(raw, dtype=object)
+    parsed = pd.to_datetime(raw, format=JIRA_TIME_FORMAT, utc=True)
+    return parsed.dt.tz_convert(tz or configured_timezone() or reported_timezone(raw))
+
+
+def same_timezone(frames) -> list:
+    """`frames` with their timezone-aware columns converted to the first frame's timezone, so they concatenate as datetimes."""
+    first = frames[0]
+    converted = []
+    for df in frames:
+        columns = [col for col in df.select_dtypes(include=['datetimetz']).columns
+                   if col in first and isinstance(first[col].dtype, pd.DatetimeTZDtype) and str(df[col].dt.tz) != str(first[col].dt.tz)]
+        converted.append(df.assign(**{col: df[col].dt.tz_convert(first[col].dt.tz) for col in columns}) if columns else df)
+    return converted
+
+
+def format_elapsed(elapsed: pd.Series) -> pd.Series:
+    """Vectorized 'D days, H hours, M minutes, S seconds' (days omitted when 0) for a timedelta series."""
+    seconds = elapsed.dt.total_seconds()
+    days = seconds // 86400
+    hours = (seconds - days * 86400) // 3600
+    minutes = (seconds - days * 86400 - hours * 3600) // 60
+    rest = seconds - days * 86400 - hours * 3600 - minutes * 60
+    text = (hours.astype('Int64').astype(str) + ' hours, ' + minutes.astype('Int64').astype(str) + ' minutes, '
+            + rest.astype(str) + ' seconds')
+    return text.where(days <= 0, days.astype('Int64').astype(str) + ' days, ' + text)
+
+
+def hours_in_previous_status(events: pd.DataFrame, created: pd.Series) -> pd.Series:
+    """
+    Hours between each transition and the one before it (or the issue's creation).
+
+    `events` must be in transition order within each issue; `created` maps JIRA Key to creation time.
+    """
+    previous = events.groupby('JIRA Key', sort=False, observed=True)['Changed Date'].shift(1)
+    previous = previous.fillna(events['JIRA Key'].map(created).astype(events['Changed Date'].dtype))
+    return (events['Changed Date'] - previous).dt.total_seconds() / 3600
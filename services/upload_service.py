@@ -0,0 +1,146 @@
+import os
+import base64
+import re
+import time
+import uuid
+import hashlib
+import tempfile
+from pathlib import Path
+
+import pandas as pd
+
+from services.cache_service import dataset_meta, load_tables, save_tables, set_current
+from services.changelog_service import split_wide
+from services.dtype_service import compact_tables
+from services.flow_service import flow_deltas, save_flow
+
+# Partial uploads are streamed here, then parsed from disk
+UPLOAD_DIR = Path(os.getenv('UPLOAD_DIR', Path(tempfile.gettempdir()) / 'jira-quickview-uploads'))
+# Bytes copied per read when streaming a request body or hashing a file
+COPY_CHUNK = 1024 * 1024
+# Uploaded files are cached as dataset UPLOAD_PREFIX + content hash
+UPLOAD_PREFIX = 'upload-'
+# Partial uploads older than this are removed
+STALE_UPLOAD_SECONDS = 24 * 60 * 60
+UPLOAD_EXTENSIONS = ('.csv', '.xlsx')
+
+
+class UploadError(ValueError):
+    """An upload request or file the app cannot accept."""
+
+
+def _part_path(upload_id):
+    if not re.fullmatch(r'[0-9a-f]{32}', upload_id or ''):
+        raise UploadError(f"Invalid upload id: {upload_id!r}")
+    return UPLOAD_DIR / f'{upload_id}.part'
+
+
+def start_upload() -> str:
+    """Open a new chunked upload and return its id."""
+    UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
+    for stale in UPLOAD_DIR.glob('*.part'):
+        if time.time() - stale.stat().st_mtime > STALE_UPLOAD_SECONDS:
+            stale.unlink(missing_ok=True)
+    upload_id = uuid.uuid4().hex
+    _part_path(upload_id).touch()
+    return upload_id
+
+
+def append_chunk(upload_id, offset: int, stream) -> int:
+    """
+    Append a request body (a file-like `stream`) at byte `offset` of an upload.
+
+    Chunks must arrive in order; a chunk that was already received is
+    accepted again without being written twice. Returns the new size.
+    """
+    path = _part_path(upload_id)
+    if not path.exists():
+        raise UploadError(f"Unknown upload {upload_id}")
+    size = path.stat().st_size
+    if offset > size:
+        raise UploadError(f"Chunk at offset {offset} but only {size} bytes received")
+    with open(path, 'r+b') as f:
+        f.seek(offset)
+        while True:
+            block = stream.read(COPY_CHUNK)
+            if not block:
+                break
+            f.write(block)
+        f.truncate()
+        return f.tell()
+
+
+def save_base64(file_contents) -> Path:
+    """
+    Decode a `dcc.Upload` data URL into a new partial upload file, a slice at a time.
+
+    Returns the file's path; the caller removes it.
+    """
+    content_string = file_contents.split(',', 1)[1]
+    path = _part_path(start_upload())
+    step = COPY_CHUNK // 3 * 4  # Whole base64 quanta per slice
+    with open(path, 'wb') as f:
+        for start in range(0, len(content_string), step):
+            f.write(base64.b64decode(content_string[start:start + step]))
+    return path
+
+
+def file_hash(path) -> str:
+    digest = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(COPY_CHUNK), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def read_upload(path, filename) -> pd.DataFrame:
+    """Parse an uploaded CSV or Excel file from disk."""
+    if filename.endswith('.csv'):
+        # One pass: concatenating row chunks would hold every chunk and the result at once
+        try:
+            return pd.read_csv(path, encoding='utf-8')
+        except UnicodeDecodeError:
+            return pd.read_csv(path, encoding='ISO-8859-1')
+    if filename.endswith('.xlsx'):
+        return pd.read_excel(path)
+    raise UploadError(f"Unsupported file type: {filename}")
+
+
+def ingest_file(path, filename):
+    """
+    Convert an uploaded file into a cached (issues, events) dataset, once per content.
+
+    Returns (dataset name, issues, events, cached?). The name is UPLOAD_PREFIX
+    plus the file's content hash, so uploading the same export again only
+    reads the Parquet cache.
+    """
+    if not filename.endswith(UPLOAD_EXTENSIONS):
+        raise UploadError(f"Unsupported file type: {filename}")
+    name = UPLOAD_PREFIX + file_hash(path)[:16]
+    if dataset_meta(name) is not None:
+        tables = load_tables(name)
+        if tables is not None:
+            set_current(name)
+            print(f"Upload '{filename}' already cached as '{name}'")
+            return (name, *tables, True)
+
+    start = time.perf_counter()
+    # Old exports carry the changelog as numbered wide columns
+    issues, events = compact_tables(*split_wide(read_upload(path, filename)))
+    entry = save_tables(issues, events, name)
+    # Return what the cache holds (dates parsed by to_storable), the same frames a later upload of the file gets
+    issues, events = load_tables(name)
+    save_flow(flow_deltas(issues, events), name, entry['version'])
+    print(f"Converted upload '{filename}' to '{name}' in {time.perf_counter() - start:.2f}s")
+    return name, issues, events, False
+
+
+def finish_upload(upload_id, filename):
+    """Ingest a completed chunked upload (see `ingest_file`) and remove the partial file."""
+    path = _part_path(upload_id)
+    if not path.exists():
+        raise UploadError(f"Unknown upload {upload_id}")
+    try:
+        return ingest_file(path, filename)
+    finally:
+        path.unlink(missing_ok=True)